@@ -0,0 +1,59 @@
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from core.logger import log_debug
+
+
+class DNSCache:
+    def __init__(self, ttl: float = 300, max_workers: int = 50):
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self._cache: Dict[str, tuple] = {}
+        self.lock = threading.Lock()
+
+    def resolve(self, host: str) -> List[str]:
+        """Resolve a hostname to its IPv4 addresses, caching answers (including failures) for ttl seconds"""
+        now = time.monotonic()
+        with self.lock:
+            entry = self._cache.get(host)
+            if entry and entry[0] > now:
+                return entry[1]
+
+        try:
+            infos = socket.getaddrinfo(host, None, family=socket.AF_INET, proto=socket.IPPROTO_TCP)
+            ips = sorted({info[4][0] for info in infos})
+        except (socket.gaierror, UnicodeError):
+            ips = []
+
+        with self.lock:
+            self._cache[host] = (now + self.ttl, ips)
+        return ips
+
+    def resolve_all(self, hosts: Iterable[str]) -> Dict[str, List[str]]:
+        """Resolve many hostnames concurrently, returning {host: [ips]}"""
+        unique_hosts = list(dict.fromkeys(h for h in hosts if h))
+        if not unique_hosts:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique_hosts))) as executor:
+            resolved = dict(zip(unique_hosts, executor.map(self.resolve, unique_hosts)))
+
+        failed = sum(1 for ips in resolved.values() if not ips)
+        log_debug(f"DNS: resolved {len(resolved) - failed}/{len(resolved)} hosts")
+        return resolved
+
+
+# Global instance
+_dns_cache: Optional[DNSCache] = None
+_dns_cache_lock = threading.Lock()
+
+
+def get_dns_cache() -> DNSCache:
+    global _dns_cache
+    with _dns_cache_lock:
+        if _dns_cache is None:
+            _dns_cache = DNSCache()
+        return _dns_cache
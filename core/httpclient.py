@@ -0,0 +1,33 @@
+import atexit
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = "ryus-recon"
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Shared HTTP session so outbound requests reuse pooled keep-alive connections"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            session = requests.Session()
+            session.headers["User-Agent"] = USER_AGENT
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _client = session
+            atexit.register(close_client)
+        return _client
+
+
+def close_client():
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
@@ -1,9 +1,12 @@
 import os
+import threading
 import time
 from datetime import datetime
 
 _verbose_level = 0
 _log_file_handle = None
+# Steps may run concurrently; keep each console/log line whole
+_log_lock = threading.Lock()
 
 
 def init_logger(project_dir, module_name="recon"):
@@ -42,25 +45,29 @@ def _write(msg):
 
 
 def log_info(msg):
-    if _verbose_level >= 1:
-        print(f"[i] {msg}")
-    _write(f"[INFO] {msg}")
+    with _log_lock:
+        if _verbose_level >= 1:
+            print(f"[i] {msg}")
+        _write(f"[INFO] {msg}")
 
 
 def log_debug(msg):
-    if _verbose_level >= 2:
-        print(f"[d] {msg}")
-    _write(f"[DEBUG] {msg}")
+    with _log_lock:
+        if _verbose_level >= 2:
+            print(f"[d] {msg}")
+        _write(f"[DEBUG] {msg}")
 
 
 def log_warn(msg):
-    print(f"[!] {msg}")
-    _write(f"[WARN] {msg}")
+    with _log_lock:
+        print(f"[!] {msg}")
+        _write(f"[WARN] {msg}")
 
 
 def log_ok(msg):
-    print(f"[+] {msg}")
-    _write(f"[OK] {msg}")
+    with _log_lock:
+        print(f"[+] {msg}")
+        _write(f"[OK] {msg}")
 
 
 def time_block(label):
@@ -1,5 +1,7 @@
 import os
+import tempfile
 from datetime import date
+from functools import lru_cache
 
 
 def ensure_project(project_dir):
@@ -21,22 +23,132 @@ def canonical_path(project_dir, file_name):
     return os.path.join(project_dir, file_name)
 
 
+@lru_cache(maxsize=None)
+def _earlier_history_dirs(project_dir, today):
+    # One scandir of the history root, newest first; DirEntry.is_dir() uses d_type, so no stat per entry
+    history_root = os.path.join(project_dir, "history")
+    try:
+        with os.scandir(history_root) as entries:
+            names = [entry.name for entry in entries if entry.name != today and entry.is_dir()]
+    except FileNotFoundError:
+        return ()
+    return tuple(sorted(names, reverse=True))
+
+
+@lru_cache(maxsize=None)
+def _previous_history_file(project_dir, marker, today):
+    # Probe newest-first and stop at the first hit: usually one stat instead of listing every dir
+    for name in _earlier_history_dirs(project_dir, today):
+        path = os.path.join(project_dir, "history", name, marker)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def previous_history_file(project_dir, marker):
+    """Path of marker in the most recent history dir before today that has it, or None"""
+    # Earlier days don't change during a run, so each lookup is done once per day
+    return _previous_history_file(project_dir, marker, date.today().isoformat())
+
+
+def open_buffered(path):
+    """Open a text file for reading with a 1 MiB buffer so large history files take few read() calls"""
+    return open(path, "r", encoding="utf-8", errors="ignore", buffering=1 << 20)
+
+
 def read_lines(path):
     if not os.path.exists(path):
         return []
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+    with open_buffered(path) as f:
         return [line.rstrip("\n") for line in f]
 
 
+def stream_nonblank_lines(path):
+    """Yield the stripped non-blank lines of path one at a time, for callers that only pass over them once"""
+    if not os.path.exists(path):
+        return
+    with open_buffered(path) as f:
+        for line in f:
+            s = line.strip()
+            if s:
+                yield s
+
+
+def read_nonblank_lines(path):
+    # Iterate the handle so the whole file is never held as one string next to the list
+    return list(stream_nonblank_lines(path))
+
+
+def read_lines_set(path):
+    # Single pass over the file handle; no intermediate list of lines
+    if not os.path.exists(path):
+        return set()
+    with open_buffered(path) as f:
+        lines = {line.strip() for line in f}
+    lines.discard("")
+    return lines
+
+
+def count_nonblank_lines(path):
+    """Number of non-blank lines in path, counted over raw bytes without decoding or keeping the lines"""
+    if not os.path.exists(path):
+        return 0
+    with open(path, "rb", buffering=1 << 20) as f:
+        return sum(1 for line in f if line.strip())
+
+
+def _clean_lines(lines):
+    for line in lines:
+        if line is None:
+            continue
+        s = str(line).strip()
+        if s:
+            yield s + "\n"
+
+
+def _write_atomic(path, write):
+    # Write into a temp file, then an atomic rename so a killed run never leaves a half-written file behind;
+    # mkstemp gives every writer its own temp name, since steps run as threads of one process
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".")
+    try:
+        with open(fd, "w", encoding="utf-8", buffering=1 << 20) as f:
+            write(f)
+        # mkstemp creates 0600; keep the mode an ordinary open() would have given the file
+        os.chmod(tmp_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def write_lines(path, lines):
-    with open(path, "w", encoding="utf-8") as f:
-        for line in lines:
-            if line is None:
-                continue
-            s = str(line).strip()
-            if not s:
-                continue
-            f.write(s + "\n")
+    # One buffered writelines, written atomically
+    _write_atomic(path, lambda f: f.writelines(_clean_lines(lines)))
+
+
+def write_text(path, text):
+    """Atomically replace path with text, written as-is"""
+    _write_atomic(path, lambda f: f.write(text))
+
+
+def filter_lines(src_path, dest_path, keep):
+    """Stream the non-blank lines of src_path that pass keep into dest_path; returns how many were kept"""
+    kept = 0
+
+    def _kept_lines():
+        nonlocal kept
+        if not os.path.exists(src_path):
+            return
+        with open_buffered(src_path) as f:
+            for line in f:
+                s = line.strip()
+                if s and keep(s):
+                    kept += 1
+                    yield s
+
+    write_lines(dest_path, _kept_lines())
+    return kept
 
 
 def get_wildcard_list_path(project_dir, wildcard_list_name):
@@ -44,36 +156,79 @@ def get_wildcard_list_path(project_dir, wildcard_list_name):
 
 
 def append_lines(path, lines):
-    with open(path, "a", encoding="utf-8") as f:
-        for line in lines:
-            if line is None:
-                continue
-            s = str(line).strip()
-            if not s:
-                continue
-            f.write(s + "\n")
+    # Encode the batch once and hand it to the kernel in one write instead of line by line through a text wrapper
+    data = "".join(_clean_lines(lines)).encode("utf-8")
+    if data:
+        with open(path, "ab") as f:
+            f.write(data)
+
+
+def append_new_lines(path, lines):
+    """Append the lines not already in path (like anew) and return them"""
+    # Hold only the candidates and strike them off while streaming the existing file;
+    # memory is O(candidates) however large path has grown, and the scan stops once all are seen
+    candidates = dict.fromkeys(s for s in (str(line).strip() for line in lines if line) if s)
+    if candidates and os.path.exists(path):
+        with open_buffered(path) as f:
+            for line in f:
+                candidates.pop(line.strip(), None)
+                if not candidates:
+                    break
+    new_lines = list(candidates)
+    if new_lines:
+        append_lines(path, new_lines)
+    return new_lines
 
 
 def compute_new_lines(existing_lines, candidate_lines):
-    existing_set = set([x.strip() for x in existing_lines if x and x.strip()])
+    if isinstance(existing_lines, (set, frozenset)):
+        # Already stripped and deduplicated (read_lines_set)
+        existing_set = set(existing_lines)
+    else:
+        # Strip each line once; empty strings drop out of the set afterwards
+        existing_set = {x.strip() for x in existing_lines if x}
+    existing_set.discard("")
     new_lines = []
     for line in candidate_lines:
         if not line:
             continue
         s = line.strip()
-        if not s:
-            continue
-        if s not in existing_set:
+        if s and s not in existing_set:
             existing_set.add(s)
             new_lines.append(s)
     return new_lines
 
 
+class PendingWrites:
+    """Collects terminal history artifacts (summaries nothing else reads) and writes them in one pass at the end of a run"""
+
+    def __init__(self):
+        self._writes = {}
+
+    def add(self, path, lines):
+        # Later writes to the same path replace earlier ones, matching write_lines
+        self._writes[path] = list(lines)
+
+    def flush(self):
+        for path in sorted(self._writes, key=lambda p: (os.path.dirname(p), p)):
+            write_lines(path, self._writes[path])
+        count = len(self._writes)
+        self._writes.clear()
+        return count
+
+
 def merge_into_canonical(project_dir, canonical_file, candidate_lines, history_dir, delta_file_name):
     canonical_file_path = canonical_path(project_dir, canonical_file)
-    existing = read_lines(canonical_file_path)
-    new_lines = compute_new_lines(existing, candidate_lines)
-
+    # Dedupe in memory first; nothing to compare means no need to read the canonical file
+    candidates = list(dict.fromkeys(s for s in (line.strip() for line in candidate_lines if line) if s))
+    if candidates:
+        existing = read_lines_set(canonical_file_path)
+        new_lines = compute_new_lines(existing, candidates)
+    else:
+        new_lines = []
+
+    # The delta goes to disk before the canonical append: if the run dies in between, the lines are
+    # reported again next run rather than landing in the canonical file without ever being reported
     delta_path = os.path.join(history_dir, delta_file_name)
     write_lines(delta_path, new_lines)
 
@@ -84,5 +239,6 @@ def merge_into_canonical(project_dir, canonical_file, candidate_lines, history_d
         "canonical_path": canonical_file_path,
         "delta_path": delta_path,
         "new_count": len(new_lines),
+        "new_lines": new_lines,
     }
 
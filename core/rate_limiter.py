@@ -9,7 +9,7 @@ class GlobalRateLimiter:
         self.rps = requests_per_second
         self.burst_capacity = burst_capacity
         self.tokens = burst_capacity
-        self.last_update = time.time()
+        self.last_update = time.monotonic()
         self.lock = threading.Lock()
         self.tool_limits: Dict[str, float] = {}
         self.enabled = True
@@ -17,30 +17,28 @@ class GlobalRateLimiter:
     def acquire(self, tool_name: Optional[str] = None, tokens: int = 1) -> float:
         if not self.enabled:
             return 0.0
-            
+        
+        # Keep the critical section to the refill arithmetic; logging happens after the lock is released
+        wait_time = 0.0
         with self.lock:
-            current_time = time.time()
-            time_elapsed = current_time - self.last_update
+            current_time = time.monotonic()
             
             # Add tokens based on time elapsed
-            self.tokens += time_elapsed * self.rps
-            if self.tokens > self.burst_capacity:
-                self.tokens = self.burst_capacity
+            self.tokens = min(self.burst_capacity, self.tokens + (current_time - self.last_update) * self.rps)
             
-            # Check tool-specific limits
-            effective_rps = self.tool_limits.get(tool_name, self.rps) if tool_name else self.rps
-            
-            # Calculate wait time if needed
             if self.tokens < tokens:
+                # Check tool-specific limits and calculate wait time
+                effective_rps = self.tool_limits.get(tool_name, self.rps) if tool_name else self.rps
                 wait_time = (tokens - self.tokens) / effective_rps
                 self.last_update = current_time + wait_time
                 self.tokens = 0
-                log_debug(f"Rate limiting: waiting {wait_time:.2f}s for {tool_name}")
-                return wait_time
             else:
                 self.tokens -= tokens
                 self.last_update = current_time
-                return 0.0
+        
+        if wait_time > 0:
+            log_debug(f"Rate limiting: waiting {wait_time:.2f}s for {tool_name}")
+        return wait_time
     
     def set_tool_limit(self, tool_name: str, requests_per_second: float):
         with self.lock:
@@ -71,6 +69,47 @@ class GlobalRateLimiter:
             }
 
 
+class AIMDController:
+    """Adaptive concurrency limit: additive increase on fast successes, multiplicative decrease on errors"""
+    
+    def __init__(self, c_min: int = 1, c_max: int = 20, alpha: float = 0.5, beta: float = 0.5, target_latency: float = 2.0):
+        self.c_min = c_min
+        self.c_max = c_max
+        self.alpha = alpha
+        self.beta = beta
+        self.target_latency = target_latency
+        self.limit = float(c_max)
+        self.in_flight = 0
+        self.cond = threading.Condition()
+    
+    def acquire(self):
+        with self.cond:
+            while self.in_flight >= max(self.c_min, int(self.limit)):
+                self.cond.wait()
+            self.in_flight += 1
+    
+    def release(self):
+        with self.cond:
+            self.in_flight -= 1
+            self.cond.notify_all()
+    
+    def update(self, latency: float):
+        with self.cond:
+            if latency > self.target_latency:
+                self._decrease()
+            else:
+                self.limit = min(self.c_max, self.limit + self.alpha)
+            self.cond.notify_all()
+    
+    def on_error(self):
+        with self.cond:
+            self._decrease()
+    
+    def _decrease(self):
+        self.limit = max(self.c_min, self.limit * self.beta)
+        log_debug(f"AIMD: concurrency limit reduced to {int(self.limit)}")
+
+
 # Global instance
 _global_rate_limiter: Optional[GlobalRateLimiter] = None
 _rate_limiter_lock = threading.Lock()
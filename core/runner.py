@@ -1,21 +1,26 @@
 import os
 import shutil
 import subprocess
+import threading
 import time
+from functools import lru_cache
 
 from core.logger import log_info, log_debug, log_warn, get_verbose_level
 from core.rate_limiter import get_global_rate_limiter
 from core.tool_installer import ToolInstaller
 
 
+# Tool availability doesn't change during a run; cache lookups so every stage doesn't re-probe PATH
+@lru_cache(maxsize=None)
 def command_exists(command_name):
     return shutil.which(command_name) is not None
 
 
+@lru_cache(maxsize=None)
 def command_exists_with_installer(command_name):
     """Check if command exists, using the tool installer for more detailed checks."""
     # First try the basic check
-    if shutil.which(command_name):
+    if command_exists(command_name):
         return True
     
     # Then use the installer for more detailed detection
@@ -28,11 +33,7 @@ def ensure_dir(path):
     return path
 
 
-def run_command(cmd_list, cwd=None, timeout=None, apply_rate_limit=False, rate_limit=None):
-    if get_verbose_level() >= 1:
-        cwd_part = f" (cwd={cwd})" if cwd else ""
-        log_info(f"run: {' '.join(cmd_list)}{cwd_part}")
-
+def _acquire_rate_limit(cmd_list, apply_rate_limit, rate_limit):
     # Apply rate limiting if requested
     if apply_rate_limit and rate_limit:
         from core.rate_limiter import get_global_rate_limiter
@@ -51,11 +52,20 @@ def run_command(cmd_list, cwd=None, timeout=None, apply_rate_limit=False, rate_l
         if wait_time > 0:
             time.sleep(wait_time)
 
+
+def run_command(cmd_list, cwd=None, timeout=None, apply_rate_limit=False, rate_limit=None, input_data=None):
+    if get_verbose_level() >= 1:
+        cwd_part = f" (cwd={cwd})" if cwd else ""
+        log_info(f"run: {' '.join(cmd_list)}{cwd_part}")
+
+    _acquire_rate_limit(cmd_list, apply_rate_limit, rate_limit)
+
     try:
         res = subprocess.run(
             cmd_list,
             cwd=cwd,
             timeout=timeout,
+            input=input_data,
             text=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
@@ -78,6 +88,221 @@ def run_command(cmd_list, cwd=None, timeout=None, apply_rate_limit=False, rate_l
     return res
 
 
+async def run_command_async(cmd_list, cwd=None, timeout=None, apply_rate_limit=False, rate_limit=None):
+    """Coroutine version of run_command for fanning out many short-lived processes on one event loop"""
+    import asyncio
+
+    if get_verbose_level() >= 1:
+        cwd_part = f" (cwd={cwd})" if cwd else ""
+        log_info(f"run (async): {' '.join(cmd_list)}{cwd_part}")
+
+    # The limiter sleeps synchronously; keep it off the event loop
+    await asyncio.to_thread(_acquire_rate_limit, cmd_list, apply_rate_limit, rate_limit)
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd_list,
+            cwd=cwd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except FileNotFoundError as e:
+        log_warn(f"missing tool: {cmd_list[0]} ({e})")
+        return _make_result(127, "", str(e))
+
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        log_warn(f"timeout: {' '.join(cmd_list)}")
+        return _make_result(124, "", "timeout")
+
+    stdout = stdout.decode("utf-8", errors="ignore")
+    stderr = stderr.decode("utf-8", errors="ignore")
+    if get_verbose_level() >= 1 and stderr:
+        log_info(f"stderr: {stderr.strip()[:2000]}")
+
+    return _make_result(proc.returncode, stdout, stderr)
+
+
+def run_command_stream(cmd_list, on_line, cwd=None, timeout=None, apply_rate_limit=False, rate_limit=None):
+    """Run a command and hand each stdout line to on_line while the process is still running"""
+    if get_verbose_level() >= 1:
+        cwd_part = f" (cwd={cwd})" if cwd else ""
+        log_info(f"run (stream): {' '.join(cmd_list)}{cwd_part}")
+
+    _acquire_rate_limit(cmd_list, apply_rate_limit, rate_limit)
+
+    try:
+        proc = subprocess.Popen(
+            cmd_list,
+            cwd=cwd,
+            encoding="utf-8",
+            errors="ignore",
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=1 << 20,
+        )
+    except FileNotFoundError as e:
+        log_warn(f"missing tool: {cmd_list[0]} ({e})")
+        return _make_result(127, "", str(e))
+
+    # Drain stderr in the background so a chatty tool cannot block on a full pipe
+    stderr_chunks = []
+    stderr_thread = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)
+    stderr_thread.start()
+
+    timed_out = threading.Event()
+
+    def _kill():
+        timed_out.set()
+        proc.kill()
+
+    timer = None
+    if timeout:
+        timer = threading.Timer(timeout, _kill)
+        timer.daemon = True
+        timer.start()
+
+    try:
+        for line in proc.stdout:
+            on_line(line.rstrip("\n"))
+    except BaseException:
+        proc.kill()
+        raise
+    finally:
+        if timer:
+            timer.cancel()
+        proc.wait()
+        stderr_thread.join()
+
+    stderr = "".join(stderr_chunks)
+    if timed_out.is_set():
+        log_warn(f"timeout: {' '.join(cmd_list)}")
+        return _make_result(124, "", stderr)
+
+    if get_verbose_level() >= 1 and stderr:
+        log_info(f"stderr: {stderr.strip()[:2000]}")
+
+    return _make_result(proc.returncode, "", stderr)
+
+
+def run_command_pipe(first_cmd, second_cmd, on_line=None, input_data=None, cwd=None, timeout=None,
+                     consumer_timeout=None, apply_rate_limit=False, rate_limit=None):
+    """Run first_cmd | second_cmd without a temp file, handing each piped line to on_line on its way through.
+    Returns (first_result, second_result); second_result.stdout holds the consumer's output"""
+    if get_verbose_level() >= 1:
+        cwd_part = f" (cwd={cwd})" if cwd else ""
+        log_info(f"run (pipe): {' '.join(first_cmd)} | {' '.join(second_cmd)}{cwd_part}")
+
+    # The consumer takes its own global token, as it would when run on its own;
+    # a tool-specific rate_limit belongs to the producer and is not copied onto it
+    _acquire_rate_limit(first_cmd, apply_rate_limit, rate_limit)
+    _acquire_rate_limit(second_cmd, apply_rate_limit, None)
+
+    popen_kwargs = dict(cwd=cwd, encoding="utf-8", errors="ignore", stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE, bufsize=1 << 20)
+    try:
+        producer = subprocess.Popen(
+            first_cmd,
+            stdin=subprocess.PIPE if input_data is not None else subprocess.DEVNULL,
+            **popen_kwargs,
+        )
+    except FileNotFoundError as e:
+        log_warn(f"missing tool: {first_cmd[0]} ({e})")
+        return _make_result(127, "", str(e)), _make_result(127, "", "")
+    try:
+        consumer = subprocess.Popen(second_cmd, stdin=subprocess.PIPE, **popen_kwargs)
+    except FileNotFoundError as e:
+        log_warn(f"missing tool: {second_cmd[0]} ({e})")
+        producer.kill()
+        producer.wait()
+        return _make_result(-9, "", ""), _make_result(127, "", str(e))
+
+    # Feed stdin and drain every other pipe in the background so neither process can block
+    outputs = {}
+    threads = [
+        threading.Thread(target=lambda: outputs.update(first_err=producer.stderr.read()), daemon=True),
+        threading.Thread(target=lambda: outputs.update(second_err=consumer.stderr.read()), daemon=True),
+        threading.Thread(target=lambda: outputs.update(second_out=consumer.stdout.read()), daemon=True),
+    ]
+    if input_data is not None:
+        def _feed():
+            try:
+                producer.stdin.write(input_data)
+                producer.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+        threads.append(threading.Thread(target=_feed, daemon=True))
+    for t in threads:
+        t.start()
+
+    timed_out = threading.Event()
+
+    def _kill():
+        timed_out.set()
+        producer.kill()
+
+    timer = None
+    if timeout:
+        timer = threading.Timer(timeout, _kill)
+        timer.daemon = True
+        timer.start()
+
+    try:
+        for line in producer.stdout:
+            if on_line:
+                on_line(line.rstrip("\n"))
+            try:
+                consumer.stdin.write(line)
+            except BrokenPipeError:
+                # Consumer exited early; close our end so the producer gets SIGPIPE like in a shell pipeline
+                producer.stdout.close()
+                break
+    except BaseException:
+        producer.kill()
+        consumer.kill()
+        raise
+    finally:
+        if timer:
+            timer.cancel()
+        try:
+            consumer.stdin.close()
+        except BrokenPipeError:
+            pass
+        producer.wait()
+
+    consumer_timed_out = False
+    try:
+        consumer.wait(timeout=consumer_timeout)
+    except subprocess.TimeoutExpired:
+        consumer_timed_out = True
+        consumer.kill()
+        consumer.wait()
+    for t in threads:
+        t.join()
+
+    if timed_out.is_set():
+        log_warn(f"timeout: {' '.join(first_cmd)}")
+        first = _make_result(124, "", outputs.get("first_err"))
+    else:
+        first = _make_result(producer.returncode, "", outputs.get("first_err"))
+
+    if consumer_timed_out:
+        log_warn(f"timeout: {' '.join(second_cmd)}")
+        second = _make_result(124, outputs.get("second_out"), outputs.get("second_err"))
+    else:
+        second = _make_result(consumer.returncode, outputs.get("second_out"), outputs.get("second_err"))
+
+    if get_verbose_level() >= 1:
+        for res in (first, second):
+            if res.stderr:
+                log_info(f"stderr: {res.stderr.strip()[:2000]}")
+
+    return first, second
+
+
 def _make_result(returncode, stdout, stderr):
     class result:
         pass
@@ -0,0 +1,48 @@
+"""
+Long-lived SecretFinder worker - runs SecretFinder.py once per URL read from stdin
+inside a single interpreter, so its imports are only paid for once.
+
+Usage: python3 secretfinder_worker.py /path/to/SecretFinder.py
+
+Protocol: one URL per stdin line; for each, writes "<rc>\n<length>\n<output>" to stdout,
+where length is the size in bytes of the UTF-8 encoded output (the pipe is read in binary mode).
+"""
+
+import contextlib
+import io
+import runpy
+import sys
+
+
+def scan(script_path, url):
+    out = io.StringIO()
+    sys.argv = [script_path, "-i", url, "-o", "cli"]
+    rc = 0
+    with contextlib.redirect_stdout(out):
+        try:
+            runpy.run_path(script_path, run_name="__main__")
+        except SystemExit as e:
+            rc = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            rc = 1
+    return rc, out.getvalue()
+
+
+def main():
+    script_path = sys.argv[1]
+    # Write bytes so the length prefix is exact; a text pipe would translate any \r\n in the output
+    stdout = sys.stdout.buffer
+    stdout.write(b"ready\n")
+    stdout.flush()
+    for line in sys.stdin:
+        url = line.strip()
+        if not url:
+            continue
+        rc, output = scan(script_path, url)
+        data = output.encode("utf-8", errors="replace")
+        stdout.write(f"{rc}\n{len(data)}\n".encode() + data)
+        stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import os
+import threading
+
+from core.project import PendingWrites, canonical_path, previous_history_file, read_nonblank_lines
+
+
+class PreviousRunIndex:
+    """Sets parsed from the previous run's history files, loaded once per run and shared by every step"""
+
+    def __init__(self, project_dir):
+        self.project_dir = project_dir
+        self._sets = {}
+        self._lock = threading.Lock()
+
+    def get(self, marker, parse):
+        with self._lock:
+            if marker in self._sets:
+                return self._sets[marker]
+        path = previous_history_file(self.project_dir, marker)
+        parsed = parse(path) if path else None
+        with self._lock:
+            return self._sets.setdefault(marker, parsed)
+
+
+class ReconSession:
+    """State shared by every step of a single recon run"""
+
+    def __init__(self, project_dir, history_dir):
+        self.project_dir = project_dir
+        self.history_dir = history_dir
+        self.pending = PendingWrites()
+        self.previous = PreviousRunIndex(project_dir)
+        self._cache = {}
+
+    def read_canonical(self, name):
+        """Read a canonical project file, reusing the parsed lines until the file changes"""
+        path = canonical_path(self.project_dir, name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return []
+
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._cache.get(name)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        lines = read_nonblank_lines(path)
+        self._cache[name] = (key, lines)
+        return lines
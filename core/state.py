@@ -0,0 +1,67 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import date
+
+
+class ScanState:
+    """Per-project record of what each module has already scanned, kept in <project>/.state.db"""
+
+    def __init__(self, project_dir):
+        self.path = os.path.join(project_dir, ".state.db")
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS scanned ("
+                "module TEXT NOT NULL, item TEXT NOT NULL, first_seen TEXT NOT NULL, "
+                "PRIMARY KEY (module, item))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS alive ("
+                "host TEXT NOT NULL, url TEXT NOT NULL, checked_at REAL NOT NULL, "
+                "PRIMARY KEY (host, url))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call; steps run on different threads
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def scanned(self, module):
+        """Set of items the module has scanned in any earlier run"""
+        with self._connect() as conn:
+            return {row[0] for row in conn.execute("SELECT item FROM scanned WHERE module = ?", (module,))}
+
+    def mark_scanned(self, module, items):
+        """Record items as scanned by the module in a single transaction"""
+        today = date.today().isoformat()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO scanned (module, item, first_seen) VALUES (?, ?, ?)",
+                ((module, item, today) for item in items),
+            )
+
+    def alive_since(self, cutoff):
+        """{host: [alive urls]} for hosts confirmed alive at or after the cutoff timestamp"""
+        alive = {}
+        with self._connect() as conn:
+            for host, url in conn.execute("SELECT host, url FROM alive WHERE checked_at >= ? AND url != ''", (cutoff,)):
+                alive.setdefault(host, []).append(url)
+        return alive
+
+    def prune_alive(self, cutoff):
+        """Drop alive results checked before the cutoff timestamp; returns how many rows went"""
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM alive WHERE checked_at < ?", (cutoff,)).rowcount
+
+    def mark_alive(self, urls_by_host, checked_at):
+        """Record each host's alive urls as confirmed at checked_at in a single transaction"""
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO alive (host, url, checked_at) VALUES (?, ?, ?)",
+                ((host, url, checked_at) for host, urls in urls_by_host.items() for url in urls),
+            )
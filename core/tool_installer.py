@@ -20,6 +20,8 @@ class ToolInstaller:
         self.system = platform.system().lower()
         self.default_install_dir = os.path.expanduser(self.install_settings.get('default_install_dir', '~/tools'))
         self.go_bin_dir = os.path.expanduser(self.install_settings.get('go_bin_dir', '~/.local/bin'))
+        # check_tool_installed results; a git tool check can mean several `pip show` subprocesses
+        self._installed_cache: Dict[str, bool] = {}
         
     def check_go_available(self) -> bool:
         """Check if Go is available for Go-based tools."""
@@ -31,6 +33,11 @@ class ToolInstaller:
     
     def check_tool_installed(self, tool_name: str) -> bool:
         """Check if a tool is already installed."""
+        if tool_name not in self._installed_cache:
+            self._installed_cache[tool_name] = self._check_tool_installed(tool_name)
+        return self._installed_cache[tool_name]
+    
+    def _check_tool_installed(self, tool_name: str) -> bool:
         tool_config = self.install_config.get(tool_name, {})
         if not tool_config:
             return False
@@ -236,14 +243,22 @@ class ToolInstaller:
         log_info(f"Installing {tool_name} (type: {tool_type})")
         
         if tool_type == 'go':
-            return self.install_go_tool(tool_name, tool_config)
+            installed = self.install_go_tool(tool_name, tool_config)
         elif tool_type == 'git':
-            return self.install_git_tool(tool_name, tool_config)
+            installed = self.install_git_tool(tool_name, tool_config)
         elif tool_type == 'system':
-            return self.install_system_tool(tool_name, tool_config)
+            installed = self.install_system_tool(tool_name, tool_config)
         else:
             log_warn(f"Unknown tool type for {tool_name}: {tool_type}")
             return False
+        
+        if installed:
+            # Drop any cached "missing" answer for this tool
+            self._installed_cache.pop(tool_name, None)
+            from core.runner import command_exists, command_exists_with_installer
+            command_exists.cache_clear()
+            command_exists_with_installer.cache_clear()
+        return installed
     
     def install_all_tools(self) -> Dict[str, bool]:
         """Install all configured tools."""
@@ -2,12 +2,169 @@
 Tool execution module - Centralized external tool command execution
 """
 
+import itertools
 import os
-from datetime import date
-from core.runner import run_command, command_exists_with_installer
-from core.project import merge_into_canonical, write_lines, read_lines
+import re
+from urllib.parse import urlsplit
+from core.runner import run_command, run_command_pipe, run_command_stream, command_exists_with_installer
+from core.project import merge_into_canonical, write_lines, filter_lines, open_buffered, read_nonblank_lines, stream_nonblank_lines, read_lines_set, previous_history_file, count_nonblank_lines
 from core.logger import log_info, log_ok, log_warn, time_block
-from core.webhook import send_directory_notification, send_secret_notification, send_vulnerability_notification, is_valid_webhook_url
+from core.webhook import send_subdomain_notification, send_directory_notification, send_secret_notification, send_vulnerability_notification, get_discord_webhook_url
+
+
+_JS_RE = re.compile(r"\.js(?:$|[?#])", re.IGNORECASE)
+_NAABU_HOST_RE = re.compile(r'"host"\s*:\s*"([^"]+)"')
+_NAABU_PORT_RE = re.compile(r'"port"\s*:\s*(\d+)')
+# Nuclei template tags that need full parameterized URLs; everything else runs per host
+_NUCLEI_PARAM_TAGS = "xss,sqli,lfi,ssrf,redirect,ssti,rce,injection"
+_CRTSH_NAME_VALUE_RE = re.compile(r'"name_value"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_CRTSH_NAME_RE = re.compile(r"(?m)^\*?\.?([^\s/]+)$")
+_SEVERITY_ORDER = {"info": 0, "low": 1, "medium": 2, "high": 3, "critical": 4}
+_URL_ORIGIN_RE = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*://[^/?#\s]+")
+# Byte-level URL scans for mmap'd history files
+_URL_NETLOC_BRE = re.compile(rb"https?://([^/?#\s]+)")
+_URL_HOST_BRE = re.compile(rb"(?m)^[A-Za-z][A-Za-z0-9+.-]*://(?:[^/?#\s@]*@)?(\[[^\]\s]*\]|[^/?#\s:]*)")
+
+
+def _shard_lines(path, shard_prefix, count, min_lines):
+    """Split the non-blank lines of path round-robin into count files named shard_prefix.<i>.txt.
+    Returns the shard paths, or None (and no files) when path has fewer than min_lines lines"""
+    shard_paths = [f"{shard_prefix}.{i}.txt" for i in range(count)]
+    total = 0
+    outs = [open(shard, "w", encoding="utf-8", buffering=1 << 20) for shard in shard_paths]
+    try:
+        with open_buffered(path) as f:
+            for line in f:
+                s = line.strip()
+                if s:
+                    outs[total % count].write(s + "\n")
+                    total += 1
+    finally:
+        for out in outs:
+            out.close()
+    if total < min_lines:
+        for shard in shard_paths:
+            os.remove(shard)
+        return None
+    return shard_paths
+
+
+def _retry_after_seconds(value, default):
+    """Parse a Retry-After header given either in seconds or as an HTTP date"""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        from datetime import datetime, timezone
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+
+def _json_line(line):
+    """Decode one JSON-lines record, returning None for anything that is not a JSON object"""
+    import json
+    # Banners and plain-text lines would otherwise cost a raised JSONDecodeError each
+    if not line.startswith("{"):
+        return None
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _tee_chunks(chunks, f):
+    """Pass text chunks through while copying them into the open file f"""
+    for chunk in chunks:
+        f.write(chunk)
+        yield chunk
+
+
+def _crtsh_value_batches(head, chunks):
+    """Raw name_value strings from streamed crt.sh JSON, one list per chunk; only the
+    unfinished tail of the previous chunk is carried over"""
+    buf = head
+    for chunk in itertools.chain([""], chunks):
+        buf += chunk
+        end = 0
+        batch = []
+        for match in _CRTSH_NAME_VALUE_RE.finditer(buf):
+            batch.append(match.group(1))
+            end = match.end()
+        if batch:
+            yield batch
+        rest = buf[end:]
+        key = rest.rfind('"name_value"')
+        buf = rest[key:] if key != -1 else rest[-len('"name_value"'):]
+
+
+def _httpx_url(line):
+    """URL from an httpx output line, either plain (default output) or JSON (-json)"""
+    if line.startswith("{"):
+        data = _json_line(line)
+        if data and data.get("url") and data.get("status_code") and 200 <= data["status_code"] < 600:
+            return data["url"]
+        return None
+    return line if "://" in line else None
+
+
+def _httpx_hosts(path):
+    """Hostnames probed in a previous httpx_raw.txt, built up one line at a time"""
+    hosts = set()
+    with open_buffered(path) as f:
+        for line in f:
+            url = _httpx_url(line.strip())
+            if url:
+                hosts.add(_url_host(url))
+    hosts.discard("")
+    return hosts
+
+
+def _mmap_matches(path, pattern):
+    """Group 1 of every match of a bytes regex over a whole file, scanned through mmap without a Python line loop"""
+    import mmap
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return set()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return {m.group(1).decode("utf-8", errors="ignore") for m in pattern.finditer(mm)}
+
+
+def _dirsearch_netlocs(path):
+    """host:port of every URL in a previous dirsearch report ("200  1KB  https://host/path" lines)"""
+    netlocs = _mmap_matches(path, _URL_NETLOC_BRE)
+    netlocs.discard("")
+    return netlocs
+
+
+def _url_hosts(path):
+    """Hostnames of every URL in a previous URL list"""
+    hosts = {host.strip("[]").lower() for host in _mmap_matches(path, _URL_HOST_BRE)}
+    hosts.discard("")
+    return hosts
+
+
+def _url_netloc(url):
+    try:
+        return urlsplit(url).netloc
+    except ValueError:
+        return ""
+
+
+def _url_host(url):
+    """Extract the hostname from a URL or bare host entry"""
+    if "://" not in url and not url.startswith("//"):
+        url = "//" + url
+    try:
+        return urlsplit(url).hostname or ""
+    except ValueError:
+        return ""
 
 
 class BaseTool:
@@ -15,6 +172,8 @@ class BaseTool:
     
     def __init__(self, name):
         self.name = name
+        self.session = None
+        self.pending = None
         
     def check_tool_exists(self):
         """Check if tool is available and attempt installation if missing"""
@@ -30,19 +189,23 @@ class BaseTool:
             return True
         return False
     
+    def _set_rate_limit(self, rate_limit):
+        """Register the tool-specific rate limit, returning whether rate limiting applies"""
+        if rate_limit is None:
+            return False
+        from core.rate_limiter import get_global_rate_limiter
+        limiter = get_global_rate_limiter()
+        limiter.set_tool_limit(self.name, rate_limit)
+        log_info(f"{self.name}: Using rate limit {rate_limit} RPS")
+        return True
+    
     def execute_command(self, cmd, timeout=600, rate_limit=None):
         """Execute command with tool-specific rate limiting"""
         log_info(f"Running: {' '.join(cmd)}")
         
         # Apply rate limiting if specified
-        if rate_limit is not None:
-            from core.rate_limiter import get_global_rate_limiter
-            limiter = get_global_rate_limiter()
-            limiter.set_tool_limit(self.name, rate_limit)
-            log_info(f"{self.name}: Using rate limit {rate_limit} RPS")
-            res = run_command(cmd, timeout=timeout, apply_rate_limit=True)
-        else:
-            res = run_command(cmd, timeout=timeout, apply_rate_limit=False)
+        apply_rate_limit = self._set_rate_limit(rate_limit)
+        res = run_command(cmd, timeout=timeout, apply_rate_limit=apply_rate_limit)
         
         if res.returncode != 0:
             log_warn(f"{self.name} failed with return code {res.returncode}")
@@ -52,6 +215,33 @@ class BaseTool:
             
         return res
     
+    def execute_stream(self, cmd, on_line, timeout=600, rate_limit=None):
+        """Execute command with tool-specific rate limiting, handing stdout lines to on_line as they arrive"""
+        log_info(f"Running: {' '.join(cmd)}")
+        
+        apply_rate_limit = self._set_rate_limit(rate_limit)
+        res = run_command_stream(cmd, on_line, timeout=timeout, apply_rate_limit=apply_rate_limit)
+        
+        if res.returncode != 0:
+            log_warn(f"{self.name} failed with return code {res.returncode}")
+            if res.stderr:
+                log_warn(f"{self.name} stderr: {res.stderr}")
+            return None
+            
+        return res
+    
+    def execute_stream_to_file(self, cmd, raw_path, parse_line, timeout=600, rate_limit=None, append=False):
+        """Stream command stdout into raw_path, calling parse_line on each non-empty line as it arrives"""
+        with open(raw_path, "a" if append else "w", encoding="utf-8", buffering=1 << 20) as raw:
+            def on_line(line):
+                line = line.strip()
+                if not line:
+                    return
+                raw.write(line + "\n")
+                parse_line(line)
+            
+            return self.execute_stream(cmd, on_line, timeout=timeout, rate_limit=rate_limit)
+    
     def process_results(self, project_dir, history_dir, results, canonical_file, delta_file_name):
         """Process tool results using standard merge pattern"""
         merged = merge_into_canonical(
@@ -63,6 +253,26 @@ class BaseTool:
         )
         log_ok(f"{self.name}: +{merged['new_count']} new -> {merged['delta_path']}")
         return merged
+    
+    def read_canonical(self, project_dir, name):
+        """Read a canonical project file, using the session cache when running inside a recon session"""
+        if self.session is not None:
+            return self.session.read_canonical(name)
+        return read_nonblank_lines(os.path.join(project_dir, name))
+    
+    def previous_set(self, project_dir, marker, parse):
+        """Set parsed from marker in the previous run's history, or None on a first run"""
+        if self.session is not None:
+            return self.session.previous.get(marker, parse)
+        path = previous_history_file(project_dir, marker)
+        return parse(path) if path else None
+    
+    def write_output(self, path, lines):
+        """Write a history output file, deferring to the run's pending writes when available"""
+        if self.pending is not None:
+            self.pending.add(path, lines)
+        else:
+            write_lines(path, lines)
 
 
 class SubfinderTool(BaseTool):
@@ -71,30 +281,162 @@ class SubfinderTool(BaseTool):
     def __init__(self):
         super().__init__("subfinder")
     
-    def fetch_crtsh_domains(self, domain):
-        """Fetch domains from crt.sh"""
+    def _crtsh_cache_path(self, cache_dir, domain):
+        # One file per domain, replaced on refresh; freshness comes from its mtime
+        safe_domain = re.sub(r"[^A-Za-z0-9._-]", "_", domain)
+        return os.path.join(cache_dir, f"{safe_domain}.json")
+    
+    def _remove_dated_crtsh_caches(self, cache_path):
+        # Older versions kept one <domain>_<day>.json per day; drop them once the single file exists
+        import glob
+        for path in glob.glob(glob.escape(cache_path[:-len(".json")]) + "_????-??-??.json"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def fetch_crtsh_domains(self, domain, controller=None, retries=3, cache_dir=None):
+        """Fetch domains from crt.sh, reusing a cached response under a day old when cache_dir is given"""
+        import time
+        
+        cache_path = self._crtsh_cache_path(cache_dir, domain) if cache_dir else None
+        if cache_path and os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < 86400:
+            log_info(f"crt.sh: using cached response for {domain}")
+            with open(cache_path, "r", encoding="utf-8", errors="ignore") as f:
+                return self._crtsh_names(domain, iter(lambda: f.read(1 << 20), "")) or []
+        
+        resp = self._fetch_crtsh_response(domain, controller, retries)
+        with resp:
+            chunks = resp.iter_content(chunk_size=1 << 16, decode_unicode=True)
+            if not cache_path:
+                return self._crtsh_names(domain, chunks) or []
+            
+            # Tee the stream into the cache; write-then-rename so concurrent runs never read a half-written file
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    names = self._crtsh_names(domain, _tee_chunks(chunks, f))
+                if names is None:
+                    os.remove(tmp_path)
+                else:
+                    os.replace(tmp_path, cache_path)
+                    self._remove_dated_crtsh_caches(cache_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        return names or []
+    
+    def _crtsh_names(self, domain, chunks):
+        """Hostnames from crt.sh JSON text chunks; None when the response is not JSON"""
         import json
+        
+        # crt.sh answers overload and errors with HTML pages; don't hand those to the parser
+        chunks = iter(chunks)
+        head = ""
+        for chunk in chunks:
+            head = chunk.lstrip()
+            if head:
+                break
+        if not head or head[0] not in "[{":
+            log_warn(f"crt.sh returned a non-JSON response for {domain}")
+            return None
+        if head[0] != "[":
+            return []
+        
+        # Pull name_value strings straight out of the text as it streams in instead of building the
+        # whole certificate tree; large orgs return 100+ MB, and only one chunk is held at a time
+        names = set()
+        for batch in _crtsh_value_batches(head, chunks):
+            values = []
+            for value in batch:
+                if "\\" in value:
+                    # Multi-name certificates only escape the newlines; skip the JSON decoder for those
+                    unescaped = value.replace("\\n", "\n")
+                    if "\\" in unescaped:
+                        try:
+                            unescaped = json.loads(f'"{value}"')
+                        except json.JSONDecodeError:
+                            continue
+                    value = unescaped
+                values.append(value)
+            # One regex pass per chunk drops "*." prefixes and entries with spaces or paths
+            names.update(_CRTSH_NAME_RE.findall("\n".join(values).lower()))
+        return sorted(names)
+    
+    def _fetch_crtsh_response(self, domain, controller=None, retries=3):
+        """Open a streaming crt.sh JSON response for a domain, backing off on 429/503 responses"""
+        import time
         import urllib.parse
-        import urllib.request
+        from core.httpclient import get_client
+        from core.rate_limiter import get_global_rate_limiter
         
         q = urllib.parse.quote(domain)
         url = f"https://crt.sh/?q={q}&output=json"
-        req = urllib.request.Request(url, headers={"User-Agent": "ryus-recon"})
+        client = get_client()
+        limiter = get_global_rate_limiter()
         
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            raw = resp.read().decode("utf-8", errors="ignore")
-        
-        try:
-            data = json.loads(raw)
-            domains = set()
-            for entry in data:
-                name_value = entry.get("name_value", "")
-                for name in name_value.split():
-                    if name and "*" not in name:
-                        domains.add(name.lower().strip())
-            return sorted(domains)
-        except json.JSONDecodeError:
-            return []
+        for attempt in range(retries + 1):
+            wait_time = limiter.acquire("crtsh")
+            if wait_time > 0:
+                time.sleep(wait_time)
+            
+            if controller:
+                controller.acquire()
+            start = time.monotonic()
+            try:
+                resp = client.get(url, timeout=30, stream=True)
+            except Exception:
+                if controller:
+                    controller.on_error()
+                raise
+            finally:
+                if controller:
+                    controller.release()
+            
+            if resp.status_code in (429, 503) and attempt < retries:
+                resp.close()
+                if controller:
+                    controller.on_error()
+                delay = _retry_after_seconds(resp.headers.get("Retry-After"), default=2 ** attempt)
+                log_warn(f"crt.sh returned {resp.status_code} for {domain}; retrying in {delay:.0f}s")
+                time.sleep(delay)
+                continue
+            if resp.status_code >= 400:
+                resp.close()
+                if controller:
+                    controller.on_error()
+                resp.raise_for_status()
+            
+            if controller:
+                controller.update(time.monotonic() - start)
+            resp.encoding = resp.encoding or "utf-8"
+            return resp
+    
+    def fetch_crtsh_all(self, domains, max_workers=20, cache_dir=None):
+        """Fetch crt.sh domains for every target concurrently"""
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        
+        names = []
+        if not domains:
+            return names
+        
+        from core.rate_limiter import AIMDController
+        
+        pool_size = min(max_workers, len(domains))
+        controller = AIMDController(c_min=1, c_max=pool_size)
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            futures = {
+                executor.submit(self.fetch_crtsh_domains, domain, controller, cache_dir=cache_dir): domain
+                for domain in domains
+            }
+            for future in as_completed(futures):
+                try:
+                    names.extend(future.result())
+                except Exception as e:
+                    log_warn(f"crt.sh fetch failed for {futures[future]}: {e}")
+        return names
     
     def run(self, project_dir, history_dir, args):
         """Execute subfinder with CRT.sh integration"""
@@ -103,11 +445,8 @@ class SubfinderTool(BaseTool):
         
         all_domains = []
         
-        # Get existing canonical domains
-        canonical_path = os.path.join(project_dir, "canonical.txt")
-        existing_domains = set()
-        if os.path.exists(canonical_path):
-            existing_domains = set(read_lines(canonical_path))
+        # Get existing canonical domains; only membership is needed, so build the set in one pass
+        existing_domains = read_lines_set(os.path.join(project_dir, "canonical.txt"))
         
         # Get wildcard list path
         from core.project import get_wildcard_list_path
@@ -115,30 +454,30 @@ class SubfinderTool(BaseTool):
         if not os.path.exists(wild_path):
             raise SystemExit(f"Missing wildcard list: {wild_path}")
         
-        # Run subfinder with wildcard list
-        log_info("Running subfinder with wildcard list")
-        cmd = [
-            "subfinder", "-dL", wild_path,
-            "-all", "-recursive",
-            "-o", os.path.join(history_dir, "subfinder_subs.txt"),
-            "-rl", str(args.subfinder_rl)
-        ]
-        
-        # Get rate limit from args and execute
-        rate_limit = getattr(args, 'subfinder_rl', None)
-        res = self.execute_command(cmd, rate_limit=rate_limit)
-        if res:
-            subfinder_path = os.path.join(history_dir, "subfinder_subs.txt")
-            if os.path.exists(subfinder_path):
-                subfinder_domains = read_lines(subfinder_path)
-                all_domains.extend(subfinder_domains)
-        
-        # Fetch from crt.sh for wildcard targets
+        # Fetch from crt.sh in the background while subfinder runs; the stage then takes
+        # max(subfinder, crt.sh) instead of their sum
+        from concurrent.futures import ThreadPoolExecutor
         log_info("Fetching from crt.sh")
-        wild_targets = read_lines(wild_path)
-        for target_domain in wild_targets:
-            crtsh_domains = self.fetch_crtsh_domains(target_domain)
-            all_domains.extend(crtsh_domains)
+        wild_targets = read_nonblank_lines(wild_path)
+        cache_dir = os.path.join(project_dir, ".cache", "crtsh")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            crtsh_future = executor.submit(self.fetch_crtsh_all, wild_targets, cache_dir=cache_dir)
+            
+            # Run subfinder with wildcard list
+            log_info("Running subfinder with wildcard list")
+            cmd = [
+                "subfinder", "-dL", wild_path,
+                "-all", "-recursive", "-silent",
+                "-rl", str(args.subfinder_rl)
+            ]
+            
+            # Get rate limit from args and execute; stdout is archived to subfinder_subs.txt and
+            # collected as it streams, so the file is never read back
+            rate_limit = getattr(args, 'subfinder_rl', None)
+            subfinder_path = os.path.join(history_dir, "subfinder_subs.txt")
+            self.execute_stream_to_file(cmd, subfinder_path, all_domains.append, rate_limit=rate_limit)
+            
+            all_domains.extend(crtsh_future.result())
         
         # Remove duplicates and existing domains
         new_domains = list(set(all_domains) - existing_domains)
@@ -150,11 +489,12 @@ class SubfinderTool(BaseTool):
             merged = self.process_results(project_dir, history_dir, new_domains, "subs.txt", "new_subs.txt")
             
             # Discord notification
-            if merged['new_count'] > 0:
-                webhook_file = os.path.expanduser("~/.recon_discord")
-                if os.path.exists(webhook_file) and is_valid_webhook_url(webhook_file):
+            if merged['new_count'] > 0 and getattr(args, "discord_webhook", False):
+                webhook_url = get_discord_webhook_url()
+                if webhook_url:
                     project_name = os.path.basename(project_dir.rstrip('/'))
-                    send_directory_notification(webhook_file, project_name, merged['delta_path'], merged['new_count'])
+                    send_subdomain_notification(webhook_url, project_name, merged['new_count'], None,
+                                                sample_subs=merged['new_lines'][:5])
 
 
 class HttpxTool(BaseTool):
@@ -163,81 +503,55 @@ class HttpxTool(BaseTool):
     def __init__(self):
         super().__init__("httpx")
     
-    def get_incremental_targets(self, project_dir, history_dir):
-        """Get new subs to check (avoid rechecking)"""
-        existing_alive = set()
-        alive_path = os.path.join(project_dir, "alive.txt")
-        if os.path.exists(alive_path):
-            existing_alive = set(read_lines(alive_path))
-        
+    def write_incremental_targets(self, project_dir, history_dir, targets_path):
+        """Write the subs still to check (avoid rechecking) to targets_path; returns how many there are"""
         # Get subs from today and merge into canonical
         today_subs = os.path.join(history_dir, "subdomains.txt")
         if os.path.exists(today_subs):
-            subs = read_lines(today_subs)
+            subs = read_nonblank_lines(today_subs)
             self.process_results(project_dir, history_dir, subs, "subs.txt", "new_subs.txt")
         
-        # Check previous runs to find already processed hosts
-        history_dirs = [d for d in os.listdir(os.path.join(project_dir, "history")) 
-                       if os.path.exists(os.path.join(project_dir, "history", d, "httpx_raw.txt"))]
-        
-        if len(history_dirs) > 1:
-            today = date.today().isoformat()
-            previous_dirs = [d for d in history_dirs if d != today]
-            if previous_dirs:
-                previous_dir = max(previous_dirs)
-                previous_httpx = os.path.join(project_dir, "history", previous_dir, "httpx_raw.txt")
-                if os.path.exists(previous_httpx):
-                    previously_checked = set(read_lines(previous_httpx))
-                    all_subs = set(read_lines(os.path.join(project_dir, "subs.txt")))
-                    return list(all_subs - previously_checked)
-        
-        return read_lines(os.path.join(project_dir, "subs.txt"))
+        # Check previous runs to find already processed hosts; subs.txt is streamed
+        # straight into the targets file instead of being loaded as a list
+        previously_checked = self.previous_set(project_dir, "httpx_raw.txt", _httpx_hosts)
+        if previously_checked is None:
+            previously_checked = set()
+        return filter_lines(os.path.join(project_dir, "subs.txt"), targets_path,
+                            lambda sub: sub not in previously_checked)
     
     def run(self, project_dir, history_dir, args):
         """Execute httpx alive checking"""
         if not self.check_tool_exists():
             return
         
-        targets = self.get_incremental_targets(project_dir, history_dir)
-        if not targets:
+        temp_targets_path = os.path.join(history_dir, "targets_httpx.txt")
+        if not self.write_incremental_targets(project_dir, history_dir, temp_targets_path):
             log_info("No new targets to check")
             return
         
-        temp_targets_path = os.path.join(history_dir, "targets_httpx.txt")
-        write_lines(temp_targets_path, targets)
-        
         cmd = [
             "httpx", "-l", temp_targets_path,
-            "-o", os.path.join(history_dir, "httpx_raw.txt"),
             "-threads", "200", "-ports", "443,80,8080,8000,8888"
         ]
         
         if hasattr(args, 'threads') and args.threads:
             cmd.extend(["-threads", str(args.threads)])
         
+        # Stream stdout into httpx_raw.txt and parse JSON results as they arrive
+        alive_urls = []
+        
+        def parse_line(line):
+            url = _httpx_url(line)
+            if url:
+                alive_urls.append(url)
+        
         # Get rate limit and execute
         rate_limit = getattr(args, 'httpx_rl', None)
-        res = self.execute_command(cmd, rate_limit=rate_limit, timeout=1200)
+        httpx_raw_path = os.path.join(history_dir, "httpx_raw.txt")
+        res = self.execute_stream_to_file(cmd, httpx_raw_path, parse_line, rate_limit=rate_limit, timeout=1200)
         if not res:
             return
         
-        # Parse JSON results and extract URLs
-        import json
-        alive_urls = []
-        httpx_raw_path = os.path.join(history_dir, "httpx_raw.txt")
-        if os.path.exists(httpx_raw_path):
-            with open(httpx_raw_path, "r", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            data = json.loads(line)
-                            if data.get("status_code") and 200 <= data["status_code"] < 600:
-                                if data.get("status_code") and 200 <= data["status_code"] < 600:
-                                    alive_urls.append(data["url"])
-                        except json.JSONDecodeError:
-                            continue
-        
         if alive_urls:
             self.process_results(project_dir, history_dir, alive_urls, "alive.txt", "new_alive.txt")
 
@@ -265,7 +579,6 @@ class NaabuTool(BaseTool):
         
         cmd = [
             "naabu", "-l", alive_file,
-            "-o", os.path.join(history_dir, "naabu_raw.txt"),
             "-json", "-silent",
             "-p", "1-65535"
         ]
@@ -273,30 +586,23 @@ class NaabuTool(BaseTool):
         if hasattr(args, 'threads') and args.threads:
             cmd.extend(["-c", str(args.threads)])
         
+        # Parse naabu JSON results as they are streamed into naabu_raw.txt
+        ports = []
+        
+        def parse_line(line):
+            # Only host and port are needed; pull them out without building a dict per line
+            host = _NAABU_HOST_RE.search(line)
+            port = _NAABU_PORT_RE.search(line)
+            if host and port:
+                ports.append(f"{host.group(1)}:{port.group(1)}")
+        
         # Get rate limit and execute
         rate_limit = getattr(args, 'naabu_rl', None)
-        res = self.execute_command(cmd, rate_limit=rate_limit, timeout=1800)
+        naabu_raw_path = os.path.join(history_dir, "naabu_raw.txt")
+        res = self.execute_stream_to_file(cmd, naabu_raw_path, parse_line, rate_limit=rate_limit, timeout=1800)
         if not res:
             return
         
-        # Parse naabu JSON results
-        import json
-        ports = []
-        naabu_raw_path = os.path.join(history_dir, "naabu_raw.txt")
-        if os.path.exists(naabu_raw_path):
-            with open(naabu_raw_path, "r", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            data = json.loads(line)
-                            host = data.get("host")
-                            port = data.get("port")
-                            if host and port:
-                                ports.append(f"{host}:{port}")
-                        except json.JSONDecodeError:
-                            continue
-        
         if ports:
             merged = self.process_results(project_dir, history_dir, ports, "ports.txt", "new_ports.txt")
             log_ok(f"naabu: +{len(ports)} new ports -> {merged['delta_path']}")
@@ -309,47 +615,29 @@ class NmapTool(BaseTool):
         super().__init__("nmap")
     
     def get_incremental_hosts(self, project_dir, history_dir):
-        """Get hosts to scan (avoid re-scanning)"""
-        # Get alive hosts to scan
-        alive_hosts = set()
-        alive_file = os.path.join(project_dir, "alive.txt")
-        if os.path.exists(alive_file):
-            alive_hosts = set(read_lines(alive_file))
-        
-        # Check for previous nmap scans to avoid re-scanning
-        history_dirs = [d for d in os.listdir(os.path.join(project_dir, "history")) 
-                       if os.path.exists(os.path.join(project_dir, "history", d, "nmap_raw.xml"))]
-        
-        if len(history_dirs) > 1:
-            today = date.today().isoformat()
-            previous_dirs = [d for d in history_dirs if d != today]
-            if previous_dirs:
-                previous_dir = max(previous_dirs)
-                previous_nmap = os.path.join(project_dir, "history", previous_dir, "nmap_raw.xml")
-                previously_scanned = set()
-                
-                if os.path.exists(previous_nmap):
-                    import xml.etree.ElementTree as ET
-                    try:
-                        tree = ET.parse(previous_nmap)
-                        root = tree.getroot()
-                        for host in root.findall(".//host"):
-                            address = host.find(".//address[@addrtype='ipv4']")
-                            if address is not None:
-                                ip = address.get("addr")
-                                if ip:
-                                    previously_scanned.add(ip)
-                    except:
-                        pass  # If XML parsing fails, just scan all
-                
-                # Only scan hosts not previously scanned
-                new_hosts = [host for host in alive_hosts if host not in previously_scanned]
-                log_info(f"Nmap incremental: scanning {len(new_hosts)} new hosts (skipping {len(alive_hosts) - len(new_hosts)} previously scanned)")
-                return new_hosts
+        """Get addresses to scan (avoid re-scanning)"""
+        # Resolve alive hosts once up front; many subdomains share an IP, so scan each address only once
+        from core.dnscache import get_dns_cache
+        alive_hosts = self.read_canonical(project_dir, "alive.txt")
+        resolved = get_dns_cache().resolve_all(_url_host(host) for host in alive_hosts)
+        write_lines(os.path.join(history_dir, "resolved.txt"),
+                    [f"{name} {ip}" for name, ips in sorted(resolved.items()) for ip in ips])
+        all_ips = {ip for ips in resolved.values() for ip in ips}
+        log_info(f"Nmap: {len(resolved)} hosts resolved to {len(all_ips)} unique addresses")
+        
+        # Skip addresses an earlier run already scanned; projects without a state DB yet seed from the previous hosts_for_nmap.txt
+        from core.state import ScanState
+        previously_scanned = ScanState(project_dir).scanned("nmap")
+        if not previously_scanned:
+            previously_scanned = self.previous_set(project_dir, "hosts_for_nmap.txt", read_lines_set)
+        if previously_scanned is not None:
+            new_ips = all_ips - previously_scanned
+            log_info(f"Nmap incremental: scanning {len(new_ips)} new hosts (skipping {len(all_ips) - len(new_ips)} previously scanned)")
+            return sorted(new_ips)
         
         # First run - scan all alive hosts
-        log_info(f"Nmap first run: scanning all {len(alive_hosts)} alive hosts")
-        return list(alive_hosts)
+        log_info(f"Nmap first run: scanning all {len(all_ips)} alive hosts")
+        return sorted(all_ips)
     
     def run(self, project_dir, history_dir, args):
         """Execute two-pass nmap scanning with skip logic"""
@@ -371,9 +659,7 @@ class NmapTool(BaseTool):
             return
         
         hosts_file = os.path.join(history_dir, "hosts_for_nmap.txt")
-        # Remove http:// and https:// prefixes from hosts
-        cleaned_hosts = [host.replace("https://", "").replace("http://", "") for host in hosts]
-        write_lines(hosts_file, cleaned_hosts)
+        write_lines(hosts_file, hosts)
         
         # Define interesting ports for quick scan
         interesting_ports = ['8080', '8443', '8888', '8000', '8081']
@@ -395,6 +681,10 @@ class NmapTool(BaseTool):
             log_warn("Quick nmap scan failed")
             return
         
+        # Every address went through the quick pass; record them so later runs only scan new ones
+        from core.state import ScanState
+        ScanState(project_dir).mark_scanned("nmap", hosts)
+        
         # Parse quick scan results to find hosts with open ports
         hosts_with_ports = set()
         quick_xml_path = os.path.join(history_dir, "nmap_quick.xml")
@@ -457,14 +747,6 @@ class NmapTool(BaseTool):
         if services:
             merged = self.process_results(project_dir, history_dir, services, "services.txt", "new_services.txt")
             log_info(f"Nmap completed: {merged['new_count']} new services from {len(hosts_with_ports)} hosts with open ports")
-            
-            # Create completion markers
-            quick_complete = os.path.join(history_dir, "nmap_quick.xml")
-            intense_complete = os.path.join(history_dir, "nmap_intense.xml")
-            with open(quick_complete, "w") as f:
-                f.write("nmap quick scan completed")
-            with open(intense_complete, "w") as f:
-                f.write("nmap intense scan completed")
         else:
             log_info("Nmap completed: No new services found")
 
@@ -486,34 +768,19 @@ class DirsearchTool(BaseTool):
             return
         
         # Handle incremental runs to avoid re-scanning
-        history_dirs = [d for d in os.listdir(os.path.join(project_dir, "history")) 
-                       if os.path.exists(os.path.join(project_dir, "history", d, "dirsearch_raw.txt"))]
-        
-        if len(history_dirs) > 1:
-            today = date.today().isoformat()
-            previous_dirs = [d for d in history_dirs if d != today]
-            if previous_dirs:
-                previous_dir = max(previous_dirs)
-                previous_dirsearch = os.path.join(project_dir, "history", previous_dir, "dirsearch_raw.txt")
-                if os.path.exists(previous_dirsearch):
-                    previously_scanned = set(read_lines(previous_dirsearch))
-                    all_alive = set(read_lines(alive_file))
-                    new_targets = list(all_alive - previously_scanned)
-                    
-                    if new_targets:
-                        temp_alive_path = os.path.join(history_dir, "new_alive.txt")
-                        write_lines(temp_alive_path, new_targets)
-                        target_alive_path = temp_alive_path
-                        log_info(f"Processing {len(new_targets)} new alive hosts for directory search")
-                    else:
-                        log_info("No new alive hosts to process for directory search")
-                        return
-                else:
-                    target_alive_path = alive_file
-            else:
-                target_alive_path = alive_file
-        else:
-            target_alive_path = alive_file
+        target_alive_path = alive_file
+        previously_scanned = self.previous_set(project_dir, "dirsearch_raw.txt", _dirsearch_netlocs)
+        if previously_scanned is not None:
+            # Own target file, so httpx's new_alive.txt delta in the same history dir is never overwritten
+            temp_alive_path = os.path.join(history_dir, "targets_dirsearch.txt")
+            new_count = filter_lines(alive_file, temp_alive_path,
+                                     lambda url: _url_netloc(url) not in previously_scanned)
+            
+            if not new_count:
+                log_info("No new alive hosts to process for directory search")
+                return
+            target_alive_path = temp_alive_path
+            log_info(f"Processing {new_count} new alive hosts for directory search")
         
         # Build dirsearch command
         cmd = [
@@ -553,7 +820,7 @@ class DirsearchTool(BaseTool):
         directories = []
         dirsearch_raw_path = os.path.join(history_dir, "dirsearch_raw.txt")
         if os.path.exists(dirsearch_raw_path):
-            with open(dirsearch_raw_path, "r", encoding="utf-8", errors="ignore") as f:
+            with open_buffered(dirsearch_raw_path) as f:
                 for line in f:
                     line = line.strip()
                     if line and "http" in line and not line.startswith("="):
@@ -563,10 +830,11 @@ class DirsearchTool(BaseTool):
             merged = self.process_results(project_dir, history_dir, directories, "directories.txt", "new_directories.txt")
             
             # Discord notification for interesting findings
-            if merged['new_count'] > 0:
-                webhook_file = os.path.expanduser("~/.recon_discord")
-                if os.path.exists(webhook_file) and is_valid_webhook_url(webhook_file):
-                    send_directory_notification(webhook_file, "directory_search", merged['delta_path'], merged['new_count'])
+            if merged['new_count'] > 0 and getattr(args, "discord_webhook", False):
+                webhook_url = get_discord_webhook_url()
+                if webhook_url:
+                    send_directory_notification(webhook_url, os.path.basename(project_dir.rstrip('/')), merged['new_count'],
+                                                sample_dirs=merged['new_lines'][:5])
 
 
 class GauUroTool(BaseTool):
@@ -575,6 +843,10 @@ class GauUroTool(BaseTool):
     def __init__(self):
         super().__init__("gau")  # Primary tool for checking
     
+    def _unique_hosts(self, urls):
+        """Hostnames of the given URLs, deduplicated in order"""
+        return [h for h in dict.fromkeys(_url_host(u) for u in urls) if h]
+    
     def run(self, project_dir, history_dir, args):
         """Execute GAU + URO parameter mining"""
         if not command_exists_with_installer("gau"):
@@ -586,52 +858,32 @@ class GauUroTool(BaseTool):
             return
         
         # Get only new alive URLs for this run
-        existing_alive = read_lines(os.path.join(project_dir, "alive.txt"))
-        
-        # Check if this is the first run by looking for existing params files
-        params_history_dirs = [d for d in os.listdir(os.path.join(project_dir, "history")) 
-                              if os.path.exists(os.path.join(project_dir, "history", d, "params.txt"))]
-        
-        if params_history_dirs and len(params_history_dirs) > 1:
-            today = date.today().isoformat()
-            previous_dirs = [d for d in params_history_dirs if d != today]
-            if previous_dirs:
-                previous_dir = max(previous_dirs)
-                previous_params = os.path.join(project_dir, "history", previous_dir, "params.txt")
-                previously_processed_urls = set()
-                
-                if os.path.exists(previous_params):
-                    with open(previous_params, "r", encoding="utf-8", errors="ignore") as f:
-                        for line in f:
-                            line = line.strip()
-                            if line:
-                                host = line.replace("https://", "").replace("http://", "").split("/")[0].strip()
-                                if host:
-                                    previously_processed_urls.add(host)
-                
-                new_hosts = []
-                for url in existing_alive:
-                    host = url.replace("https://", "").replace("http://", "").split("/")[0].strip()
-                    if host and host not in previously_processed_urls:
-                        new_hosts.append(url)
+        existing_alive = self.read_canonical(project_dir, "alive.txt")
+        
+        # Check if this is the first run by looking for params files from earlier runs
+        previously_processed_urls = self.previous_set(project_dir, "params.txt", _url_hosts)
+        if previously_processed_urls is not None:
+            # One entry per host: http:// and https:// variants would make gau fetch the same host twice
+            new_hosts = []
+            seen_hosts = set()
+            for url in existing_alive:
+                host = _url_host(url)
+                if host and host not in previously_processed_urls and host not in seen_hosts:
+                    seen_hosts.add(host)
+                    new_hosts.append(host)
+            
+            if not new_hosts:
+                log_info("No new alive hosts to process for param mining")
+                return
                 
-                if not new_hosts:
-                    log_info("No new alive hosts to process for param mining")
-                    return
-                    
-                temp_alive_path = os.path.join(history_dir, "new_alive.txt")
-                write_lines(temp_alive_path, new_hosts)
-                target_alive_path = temp_alive_path
-                log_info(f"Processing {len(new_hosts)} new alive hosts for param mining")
-            else:
-                target_alive_path = os.path.join(project_dir, "alive.txt")
+            target_hosts = new_hosts
+            log_info(f"Processing {len(new_hosts)} new alive hosts for param mining")
         else:
-            target_alive_path = os.path.join(project_dir, "alive.txt")
+            target_hosts = self._unique_hosts(existing_alive)
             log_info("First param mining run - processing all alive URLs")
         
-        # Run gau to collect URLs with parameters directly to output file
+        # Run gau once, feeding every host on stdin
         params_path = os.path.join(history_dir, "params.txt")
-        shell_cmd = f"cat {target_alive_path} | gau > {params_path}"
         log_info("Running GAU to collect URLs with parameters")
         # Get rate limit and timeout from args
         gau_rate_limit = getattr(args, 'gau_rl', None)
@@ -639,50 +891,64 @@ class GauUroTool(BaseTool):
         
         log_info(f"GAU: Using timeout {gau_timeout}s and rate limit {gau_rate_limit} RPS")
         
-        # Execute GAU with specified timeout
-        gau_res = run_command(["bash", "-c", shell_cmd], timeout=gau_timeout, rate_limit=gau_rate_limit)
+        # Get URO rate limit
+        uro_rate_limit = getattr(args, 'uro_rl', None)
+        uro_timeout = getattr(args, 'uro_timeout', 600)  # Default 10 minutes
+        
+        log_info(f"URO: Using timeout {uro_timeout}s and rate limit {uro_rate_limit} RPS")
+        
+        # Pipe gau straight into uro; the raw URLs are archived to params.txt on their way through
+        # gau repeats the same URL across providers; keep one copy (insertion ordered) as lines stream in
+        all_urls = {}
+        with open(params_path, "w", encoding="utf-8", buffering=1 << 20) as params_f:
+            def collect(line):
+                params_f.write(line + "\n")
+                url = line.strip()
+                if url:
+                    all_urls[url] = None
+            
+            gau_input = "\n".join(target_hosts) + "\n"
+            gau_res, res = run_command_pipe(["gau"], ["uro"], on_line=collect, input_data=gau_input,
+                                            timeout=gau_timeout, consumer_timeout=uro_timeout,
+                                            rate_limit=gau_rate_limit)
         if gau_res.returncode != 0:
             log_warn(f"gau failed with return code {gau_res.returncode}")
             return
         
-        # Read the output file to get count for logging and process results
-        all_urls = read_lines(params_path) if os.path.exists(params_path) else []
-        log_info(f"GAU collected {len(all_urls)} URLs")
+        log_info(f"GAU collected {len(all_urls)} unique URLs")
         
         # Process raw GAU results to create global file in root directory
         if all_urls:
-            raw_merged = self.process_results(project_dir, history_dir, all_urls, "gau_raw.txt", "new_gau_raw.txt")
-        
-        # Run URO to filter parameters from GAU output
-        uro_out = os.path.join(history_dir, "params_filtered.txt")
-        log_info("Running URO to filter URLs with parameters")
-        
-        # Get URO rate limit
-        uro_rate_limit = getattr(args, 'uro_rl', None)
-        uro_timeout = getattr(args, 'uro_timeout', 600)  # Default 10 minutes
+            raw_merged = self.process_results(project_dir, history_dir, list(all_urls), "gau_raw.txt", "new_gau_raw.txt")
         
-        log_info(f"URO: Using timeout {uro_timeout}s and rate limit {uro_rate_limit} RPS")
-        
-        # Execute URO with rate limit and timeout
-        res = run_command(["uro", "-i", params_path, "-o", uro_out], timeout=uro_timeout, rate_limit=uro_rate_limit)
         if res.returncode != 0:
             log_warn(f"uro rc={res.returncode}")
             if res.stderr:
                 log_warn(res.stderr.strip()[:2000])
             return
         
-        if os.path.exists(uro_out):
-            params = read_lines(uro_out)
-            log_info(f"URO filtered to {len(params)} parameterized URLs")
-            if params:
-                # Process parameterized URLs
-                merged = self.process_results(project_dir, history_dir, params, "params.txt", "new_params.txt")
-                
-                # Extract JavaScript URLs for SecretFinder
-                js_urls = [u for u in params if u.lower().endswith(".js")]
-                if js_urls:
-                    js_merged = self.process_results(project_dir, history_dir, js_urls, "js.txt", "new_js.txt")
-                    log_info(f"Extracted {js_merged['new_count']} new JavaScript URLs")
+        # One pass over uro output: archive it, collect params and split out JavaScript URLs for SecretFinder
+        uro_out = os.path.join(history_dir, "params_filtered.txt")
+        params = []
+        js_urls = []
+        with open(uro_out, "w", encoding="utf-8", buffering=1 << 20) as f:
+            for line in res.stdout.splitlines():
+                url = line.strip()
+                if not url:
+                    continue
+                f.write(url + "\n")
+                params.append(url)
+                if _JS_RE.search(url):
+                    js_urls.append(url)
+        
+        log_info(f"URO filtered to {len(params)} parameterized URLs")
+        if params:
+            # Process parameterized URLs
+            merged = self.process_results(project_dir, history_dir, params, "params.txt", "new_params.txt")
+            
+            if js_urls:
+                js_merged = self.process_results(project_dir, history_dir, js_urls, "js.txt", "new_js.txt")
+                log_info(f"Extracted {js_merged['new_count']} new JavaScript URLs")
 
 
 class SecretFinderTool(BaseTool):
@@ -691,20 +957,210 @@ class SecretFinderTool(BaseTool):
     def __init__(self):
         super().__init__("python3")  # Check for Python instead
     
+    def scan_urls(self, script_path, js_urls, max_workers=32, apply_rate_limit=False):
+        """Run SecretFinder once per URL as concurrent subprocesses, collecting each result as soon as it finishes.
+        Returns (findings, urls that were scanned successfully)"""
+        import asyncio
+        from core.runner import run_command_async
+        
+        # Every scan is a full Python interpreter; keep the pool near the core count so memory stays bounded
+        pool_size = min(max_workers, len(js_urls), max(4, os.cpu_count() or 1))
+        
+        async def scan_all():
+            findings = []
+            scanned = []
+            in_flight = {}
+            urls = iter(js_urls)
+            limit = float(pool_size)
+            launched = 0
+            cut_at = -1
+            while True:
+                # Top the window back up instead of waiting for a whole batch to drain
+                while len(in_flight) < int(limit):
+                    url = next(urls, None)
+                    if url is None:
+                        break
+                    cmd = ["python3", script_path, "-i", url, "-o", "cli"]
+                    task = asyncio.ensure_future(run_command_async(cmd, timeout=120, apply_rate_limit=apply_rate_limit))
+                    in_flight[task] = (url, launched)
+                    launched += 1
+                if not in_flight:
+                    return findings, scanned
+                
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    url, seq = in_flight.pop(task)
+                    res = task.result()
+                    if res.returncode != 0:
+                        log_warn(f"SecretFinder rc={res.returncode} for {url}")
+                        # AIMD: halve the window at most once per window's worth of launches
+                        if seq > cut_at:
+                            limit = max(1.0, limit / 2)
+                            cut_at = launched
+                        continue
+                    limit = min(pool_size, limit + 1 / limit)
+                    findings.extend(filter(None, (line.strip() for line in res.stdout.splitlines())))
+                    scanned.append(url)
+        
+        return asyncio.run(scan_all())
+    
+    def scan_urls_workers(self, script_path, js_urls, max_workers=32, apply_rate_limit=False, timeout=120):
+        """Run SecretFinder inside long-lived worker interpreters so each URL skips interpreter startup and imports.
+        Returns (findings, urls that were scanned successfully), or None when the workers cannot be started"""
+        import queue
+        import subprocess
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from core.rate_limiter import get_global_rate_limiter
+        
+        worker_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "secretfinder_worker.py")
+        pool_size = min(max_workers, len(js_urls), max(4, os.cpu_count() or 1))
+        limiter = get_global_rate_limiter()
+        urls = queue.SimpleQueue()
+        for url in js_urls:
+            urls.put(url)
+        
+        def spawn():
+            proc = subprocess.Popen(
+                ["python3", "-u", worker_path, script_path],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            # Binary pipes: the worker sends byte lengths, which a text-mode reader would miscount
+            if proc.stdout.readline().strip() != b"ready":
+                proc.kill()
+                proc.wait()
+                raise OSError("SecretFinder worker did not start")
+            return proc
+        
+        def scan_one(proc, url):
+            # A hung scan gets its worker killed, which surfaces here as EOF
+            timer = threading.Timer(timeout, proc.kill)
+            timer.daemon = True
+            timer.start()
+            try:
+                proc.stdin.write(url.encode("utf-8") + b"\n")
+                proc.stdin.flush()
+                rc_line = proc.stdout.readline()
+                size_line = proc.stdout.readline()
+                if not rc_line or not size_line:
+                    return None
+                size = int(size_line)
+                output = proc.stdout.read(size)
+                if len(output) != size:
+                    return None
+                return int(rc_line), output.decode("utf-8", errors="ignore")
+            except (OSError, ValueError):
+                return None
+            finally:
+                timer.cancel()
+        
+        def serve(proc):
+            findings = []
+            scanned = []
+            try:
+                while True:
+                    try:
+                        url = urls.get_nowait()
+                    except queue.Empty:
+                        return findings, scanned
+                    if apply_rate_limit:
+                        wait_time = limiter.acquire(self.name)
+                        if wait_time > 0:
+                            time.sleep(wait_time)
+                    result = scan_one(proc, url)
+                    if result is None:
+                        log_warn(f"SecretFinder worker died on {url}; restarting it")
+                        proc.kill()
+                        proc.wait()
+                        try:
+                            proc = spawn()
+                        except OSError as e:
+                            log_warn(f"SecretFinder worker could not restart ({e})")
+                            return findings, scanned
+                        continue
+                    rc, output = result
+                    if rc != 0:
+                        log_warn(f"SecretFinder rc={rc} for {url}")
+                        continue
+                    findings.extend(filter(None, (line.strip() for line in output.splitlines())))
+                    scanned.append(url)
+            finally:
+                try:
+                    proc.stdin.close()
+                except OSError:
+                    pass
+                proc.wait()
+        
+        try:
+            procs = [spawn() for _ in range(pool_size)]
+        except OSError as e:
+            log_warn(f"SecretFinder workers unavailable ({e}); falling back to one process per URL")
+            return None
+        
+        findings = []
+        scanned = []
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            for worker_findings, worker_scanned in executor.map(serve, procs):
+                findings.extend(worker_findings)
+                scanned.extend(worker_scanned)
+        return findings, scanned
+    
+    def scan_urls_inprocess(self, js_urls, max_workers=20, apply_rate_limit=False):
+        """Fetch JS files over the shared HTTP pool and run SecretFinder's regexes in this process.
+        Returns (findings, urls that were fetched and scanned)"""
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from core.httpclient import get_client
+        from core.rate_limiter import get_global_rate_limiter
+        from core.secrets_regex import scan_text
+        
+        client = get_client()
+        limiter = get_global_rate_limiter()
+        
+        def scan(url):
+            if apply_rate_limit:
+                wait_time = limiter.acquire(self.name)
+                if wait_time > 0:
+                    time.sleep(wait_time)
+            try:
+                resp = client.get(url, timeout=30)
+            except Exception as e:
+                log_warn(f"SecretFinder: failed to fetch {url} ({type(e).__name__})")
+                return None
+            if resp.status_code >= 400:
+                return None
+            return [f"{url} | {name} -> {match}" for name, match in scan_text(resp.text)]
+        
+        findings = []
+        scanned = []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(js_urls))) as executor:
+            for url, url_findings in zip(js_urls, executor.map(scan, js_urls)):
+                # Failed fetches are left unscanned so a later run tries them again
+                if url_findings is not None:
+                    findings.extend(url_findings)
+                    scanned.append(url)
+        return findings, scanned
+    
     def run(self, project_dir, history_dir, args):
         """Execute SecretFinder on JavaScript files"""
         from core.runner import command_exists
         
-        secretfinder_path = getattr(args, 'secretfinder_path', None) or "$HOME/tools/SecretFinder/SecretFinder.py"
-        
-        if not command_exists("python3"):
-            log_warn("python3 not found; skipping secrets stage")
-            return
-        
-        expanded_path = os.path.expandvars(os.path.expanduser(secretfinder_path))
-        if not os.path.exists(expanded_path):
-            log_warn(f"SecretFinder not found at {expanded_path}; skipping secrets stage")
-            return
+        legacy = getattr(args, 'legacy_secretfinder', False)
+        expanded_path = None
+        if legacy:
+            secretfinder_path = getattr(args, 'secretfinder_path', None) or "$HOME/tools/SecretFinder/SecretFinder.py"
+            
+            if not command_exists("python3"):
+                log_warn("python3 not found; skipping secrets stage")
+                return
+            
+            expanded_path = os.path.expandvars(os.path.expanduser(secretfinder_path))
+            if not os.path.exists(expanded_path):
+                log_warn(f"SecretFinder not found at {expanded_path}; skipping secrets stage")
+                return
         
         # Use root params file by default, allow flag to use history params
         use_root_params = getattr(args, 'use_root_params', False)
@@ -716,11 +1172,8 @@ class SecretFinderTool(BaseTool):
             log_warn("No params.txt found; skipping secrets stage")
             return
         
-        # Extract JavaScript URLs from params
-        js_urls = []
-        for line in read_lines(params_file):
-            if line.strip().endswith('.js'):
-                js_urls.append(line.strip())
+        # Extract JavaScript URLs from params; gau repeats URLs, so dedupe while keeping order
+        js_urls = list(dict.fromkeys(filter(_JS_RE.search, stream_nonblank_lines(params_file))))
         
         if not js_urls:
             log_info("No JavaScript URLs found in params.txt")
@@ -729,31 +1182,47 @@ class SecretFinderTool(BaseTool):
         js_file_path = os.path.join(history_dir, "js_urls.txt")
         write_lines(js_file_path, js_urls)
         
-        cmd = [
-            "python3", expanded_path,
-            "-i", js_file_path,
-            "-o", os.path.join(history_dir, "secrets_raw.txt")
-        ]
+        # Skip URLs an earlier run already scanned; projects without a state DB yet seed from the previous js_urls.txt
+        from core.state import ScanState
+        state = ScanState(project_dir)
+        previously_scanned = state.scanned("secretfinder")
+        if not previously_scanned:
+            previously_scanned = self.previous_set(project_dir, "js_urls.txt", read_lines_set)
+        if previously_scanned:
+            js_urls = [url for url in js_urls if url not in previously_scanned]
+            if not js_urls:
+                log_info("No new JavaScript URLs to scan")
+                return
         
         # Get rate limit and execute
         rate_limit = getattr(args, 'nuclei_rl', None)
-        res = self.execute_command(cmd, timeout=1200, rate_limit=rate_limit)
-        if res.returncode != 0:
-            log_warn(f"SecretFinder rc={res.returncode}")
-            if res.stderr:
-                log_warn(res.stderr.strip()[:2000])
-            return
+        apply_rate_limit = self._set_rate_limit(rate_limit)
+        log_info(f"Running SecretFinder on {len(js_urls)} JavaScript URLs")
+        if legacy:
+            result = self.scan_urls_workers(expanded_path, js_urls, apply_rate_limit=apply_rate_limit)
+            if result is None:
+                result = self.scan_urls(expanded_path, js_urls, apply_rate_limit=apply_rate_limit)
+        else:
+            result = self.scan_urls_inprocess(js_urls, apply_rate_limit=apply_rate_limit)
+        secrets, scanned = result
         
-        if os.path.exists(os.path.join(history_dir, "secrets_raw.txt")):
-            secrets = read_lines(os.path.join(history_dir, "secrets_raw.txt"))
-            if secrets:
-                merged = self.process_results(project_dir, history_dir, secrets, "secrets.txt", "new_secrets.txt")
-                
-                # Discord notification for secrets
-                if merged['new_count'] > 0:
-                    webhook_file = os.path.expanduser("~/.recon_discord")
-                    if os.path.exists(webhook_file) and is_valid_webhook_url(webhook_file):
-                        send_secret_notification(webhook_file, "secrets_found", merged['delta_path'], merged['new_count'])
+        # Only URLs that were actually scanned are recorded; failures get retried on the next run
+        if len(scanned) < len(js_urls):
+            log_warn(f"SecretFinder: {len(js_urls) - len(scanned)} URLs failed and will be retried next run")
+        state.mark_scanned("secretfinder", scanned)
+        
+        secrets_raw_path = os.path.join(history_dir, "secrets_raw.txt")
+        write_lines(secrets_raw_path, secrets)
+        
+        if secrets:
+            merged = self.process_results(project_dir, history_dir, secrets, "secrets.txt", "new_secrets.txt")
+            
+            # Discord notification for secrets
+            if merged['new_count'] > 0 and getattr(args, "discord_webhook", False):
+                webhook_url = get_discord_webhook_url()
+                if webhook_url:
+                    send_secret_notification(webhook_url, os.path.basename(project_dir.rstrip('/')), merged['new_count'],
+                                             sample_secrets=merged['new_lines'][:3])
 
 
 class NucleiTool(BaseTool):
@@ -764,56 +1233,92 @@ class NucleiTool(BaseTool):
     
     def run(self, project_dir, history_dir, args):
         """Execute Nuclei on filtered parameters"""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        
         params_file = os.path.join(project_dir, "params.txt")
         if not os.path.exists(params_file):
             log_warn("No params.txt found; skipping nuclei stage")
             return
         
-        cmd = [
-            "nuclei", "-l", params_file,
-            "-o", os.path.join(history_dir, "nuclei_raw.txt"),
-            "-json", "-silent"
-        ]
+        # Most templates only need the host; scan each scheme://host once and keep the full
+        # parameterized URLs for the templates that actually inject into parameters
+        origins = (_URL_ORIGIN_RE.match(url) for url in stream_nonblank_lines(params_file))
+        hosts = list(dict.fromkeys(m.group(0) for m in origins if m))
+        hosts_file = os.path.join(history_dir, "nuclei_hosts.txt")
+        write_lines(hosts_file, hosts)
         
         # Add custom templates if specified
+        template_args = []
         templates_path = getattr(args, 'nuclei_templates', None)
         if templates_path and os.path.exists(templates_path):
-            cmd.extend(["-t", templates_path])
+            template_args = ["-t", templates_path]
         
-        # Get rate limit and execute
-        rate_limit = getattr(args, 'nuclei_rl', None)
-        res = self.execute_command(cmd, timeout=2400, rate_limit=rate_limit)
-        if res.returncode != 0:
-            log_warn(f"Nuclei failed with return code {res.returncode}")
-            if res.stderr:
-                log_warn(res.stderr.strip()[:2000])
-            return
+        passes = [
+            (hosts_file, "nuclei_hosts", ["-etags", _NUCLEI_PARAM_TAGS]),
+            (params_file, "nuclei_params", ["-tags", _NUCLEI_PARAM_TAGS]),
+        ]
         
-        # Parse nuclei JSON results
-        import json
+        # Parse nuclei JSON results as they are streamed into nuclei_raw.txt
         vulnerabilities = []
+        severities = set()
+        
+        def parse_line(line):
+            data = _json_line(line)
+            if data and data.get("matched-at"):
+                info = data.get('info', {})
+                vulnerabilities.append(f"{data.get('matched-at')} - {info.get('name', 'unknown')}")
+                severities.add(str(info.get('severity', 'info')).lower())
+        
+        # Get rate limit and execute
+        rate_limit = getattr(args, 'nuclei_rl', None)
+        shards = max(1, getattr(args, 'nuclei_shards', 1) or 1)
         nuclei_raw_path = os.path.join(history_dir, "nuclei_raw.txt")
-        if os.path.exists(nuclei_raw_path):
-            with open(nuclei_raw_path, "r", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            data = json.loads(line)
-                            if data.get("matched-at"):
-                                vulnerability = f"{data.get('matched-at')} - {data.get('info', {}).get('name', 'unknown')}"
-                                vulnerabilities.append(vulnerability)
-                        except json.JSONDecodeError:
-                            continue
+        raw_lock = threading.Lock()
+        with open(nuclei_raw_path, "w", encoding="utf-8", buffering=1 << 20) as raw:
+            def on_line(line):
+                line = line.strip()
+                if not line:
+                    return
+                with raw_lock:
+                    raw.write(line + "\n")
+                    parse_line(line)
+            
+            for list_file, shard_name, tag_args in passes:
+                if list_file == hosts_file and not hosts:
+                    continue
+                
+                # Large lists are split across concurrent nuclei processes, each with a share of the
+                # default template concurrency, so network round-trips overlap
+                shard_files = None
+                if shards > 1:
+                    shard_files = _shard_lines(list_file, os.path.join(history_dir, shard_name), shards, min_lines=4 * shards)
+                if shard_files:
+                    shard_args = ["-c", str(max(1, 25 // len(shard_files)))]
+                    cmds = [["nuclei", "-l", shard, "-json", "-silent"] + template_args + tag_args + shard_args
+                            for shard in shard_files]
+                else:
+                    cmds = [["nuclei", "-l", list_file, "-json", "-silent"] + template_args + tag_args]
+                
+                with ThreadPoolExecutor(max_workers=len(cmds)) as executor:
+                    results = list(executor.map(
+                        lambda cmd: self.execute_stream(cmd, on_line, timeout=2400, rate_limit=rate_limit), cmds))
+                # A failed shard or pass doesn't void the others; merge whatever was collected
+                failed = [cmd[2] for cmd, res in zip(cmds, results) if not res]
+                if failed:
+                    log_warn(f"nuclei: {len(failed)}/{len(cmds)} runs failed for {shard_name} ({', '.join(failed)}); "
+                             "merging results from the rest")
         
         if vulnerabilities:
             merged = self.process_results(project_dir, history_dir, vulnerabilities, "vulnerabilities.txt", "new_vulnerabilities.txt")
             
             # Discord notification for vulnerabilities
-            if merged['new_count'] > 0:
-                webhook_file = os.path.expanduser("~/.recon_discord")
-                if os.path.exists(webhook_file) and is_valid_webhook_url(webhook_file):
-                    send_vulnerability_notification(webhook_file, "nuclei_scan", merged['delta_path'], merged['new_count'])
+            if merged['new_count'] > 0 and getattr(args, "discord_webhook", False):
+                webhook_url = get_discord_webhook_url()
+                if webhook_url:
+                    severity = max(severities, key=lambda s: _SEVERITY_ORDER.get(s, -1), default="info")
+                    send_vulnerability_notification(webhook_url, os.path.basename(project_dir.rstrip('/')), merged['new_count'], severity,
+                                                    sample_vulns=merged['new_lines'][:3])
 
 
 class EyewitnessTool(BaseTool):
@@ -871,7 +1376,8 @@ class EyewitnessTool(BaseTool):
             log_info(f"Using custom Eyewitness arguments: {args.eyewitness_args}")
         
         # Run eyewitness
-        target_count = len(read_lines(target_file))
+        # Only the count is needed, so don't materialise the target list
+        target_count = count_nonblank_lines(target_file)
         log_info(f"Running Eyewitness on {target_count} targets")
         res = self.execute_command(cmd, timeout=1800)  # 30 minute timeout
         
@@ -887,7 +1393,7 @@ class EyewitnessTool(BaseTool):
                 f"Target selection: {getattr(args, 'eyewitness_targets', 'latest')}"
             ]
             
-            write_lines(summary_path, summary_lines)
+            self.write_output(summary_path, summary_lines)
             log_ok(f"Eyewitness screenshots completed - results in {eyewitness_dir}")
 
 
@@ -908,11 +1414,15 @@ class ToolFactory:
     }
     
     @classmethod
-    def get_tool(cls, tool_name):
+    def get_tool(cls, tool_name, session=None):
         """Get tool instance by name"""
         tool_class = cls._tools.get(tool_name)
         if tool_class:
-            return tool_class()
+            tool = tool_class()
+            if session is not None:
+                tool.session = session
+                tool.pending = session.pending
+            return tool
         else:
             raise ValueError(f"Unknown tool: {tool_name}")
     
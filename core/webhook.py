@@ -1,7 +1,20 @@
 import json
-import requests
+import os
 import urllib.parse
 from datetime import datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def get_discord_webhook_url():
+    """Read Discord webhook URL from user's config file (once per process)"""
+    webhook_file = os.path.expanduser("~/.recon_discord")
+    if os.path.exists(webhook_file):
+        with open(webhook_file, "r", encoding="utf-8") as f:
+            webhook_url = f.read().strip()
+            if webhook_url and is_valid_webhook_url(webhook_url):
+                return webhook_url
+    return None
 
 
 def send_discord_notification(webhook_url, title, description, color=0x00ff00, fields=None, footer_text=None):
@@ -39,8 +52,11 @@ def send_discord_notification(webhook_url, title, description, color=0x00ff00, f
         "embeds": [embed]
     }
     
+    from core.httpclient import get_client
+    
     try:
-        response = requests.post(
+        # Shared pooled session, so repeated notifications reuse one keep-alive connection
+        response = get_client().post(
             webhook_url,
             data=json.dumps(payload),
             headers={"Content-Type": "application/json"},
@@ -60,13 +76,15 @@ def send_subdomain_notification(webhook_url, project_name, new_subs_count, new_a
         webhook_url (str): Discord webhook URL
         project_name (str): Name of the project
         new_subs_count (int): Number of new subdomains discovered
-        new_alive_count (int): Number of alive subdomains
+        new_alive_count (int): Number of alive subdomains, or None when not checked yet
         sample_subs (list): Sample of new subdomains (max 5)
     """
     if not webhook_url or new_subs_count == 0:
         return False
     
-    description = f"**{new_subs_count}** new subdomains discovered in project **{project_name}**\n**{new_alive_count}** are alive"
+    description = f"**{new_subs_count}** new subdomains discovered in project **{project_name}**"
+    if new_alive_count is not None:
+        description += f"\n**{new_alive_count}** are alive"
     
     fields = []
     
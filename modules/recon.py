@@ -1,16 +1,15 @@
 import os
-import os
 import json
-import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import date
 
 from core.runner import command_exists_with_installer, run_command, ensure_dir
-from core.project import ensure_project, today_history_dir, merge_into_canonical, write_lines, read_lines
+from core.project import ensure_project, today_history_dir, merge_into_canonical, write_lines, write_text, read_lines
+from core.session import ReconSession
 from core.logger import log_info, log_ok, log_warn, time_block, init_logger, close_logger
 from core.rate_limiter import get_global_rate_limiter, configure_rate_limiter
 from core.tools import ToolFactory
-from core.webhook import send_directory_notification, send_secret_notification, send_vulnerability_notification, is_valid_webhook_url
+from core.webhook import send_directory_notification, send_secret_notification, send_vulnerability_notification
 from core.wordlist_manager import WordlistManager
 
 module_name = "Run subfinder, crt.sh, httpx, dirsearch to find"
@@ -18,17 +17,6 @@ module_key = "1"
 cli_name = "recon"
 
 
-def get_discord_webhook_url():
-    """Read Discord webhook URL from user's config file"""
-    webhook_file = os.path.expanduser("~/.recon_discord")
-    if os.path.exists(webhook_file):
-        with open(webhook_file, "r", encoding="utf-8") as f:
-            webhook_url = f.read().strip()
-            if webhook_url and is_valid_webhook_url(webhook_url):
-                return webhook_url
-    return None
-
-
 def register_args(parser):
     parser.add_argument("--project", required=True, help="Project directory (stateful)")
     parser.add_argument("--wildcard_list", default="wild.txt", help="Wildcard scope list inside project dir")
@@ -45,6 +33,7 @@ def register_args(parser):
     parser.add_argument("--use_root_params", action="store_true", help="Use params.txt from root directory for SecretFinder")
     parser.add_argument("--nuclei", action="store_true", help="Run nuclei on filtered params")
     parser.add_argument("--screens", action="store_true", help="Run Eyewitness to capture screenshots")
+    parser.add_argument("--serial", action="store_true", help="Run steps one at a time in order instead of concurrently (for debugging)")
     
     # Eyewitness specific arguments
     parser.add_argument("--eyewitness_args", help="Custom arguments to pass to Eyewitness (e.g., '--timeout 30 --no-dns')")
@@ -52,7 +41,9 @@ def register_args(parser):
                        help="Target selection for Eyewitness: 'all' (all subs) or 'latest' (most recent alive file)")
     parser.add_argument("--eyewitness_file", help="Custom file with targets for Eyewitness")
 
+    parser.add_argument("--legacy_secretfinder", action="store_true", help="Run SecretFinder.py per URL instead of the built-in scanner")
     parser.add_argument("--secretfinder_path", default="$HOME/tools/SecretFinder/SecretFinder.py", help="Path to SecretFinder.py")
+    parser.add_argument("--nuclei_shards", type=int, default=4, help="Concurrent nuclei processes for large target lists")
     parser.add_argument("--nuclei_templates", default="/usr/share/custom-nuclei", help="Nuclei templates path")
     parser.add_argument("--discord-webhook", action="store_true", help="Send Discord notifications (requires webhook file)")
 
@@ -83,16 +74,14 @@ def run_tui(stdscr, config):
 def run_cli(args, config):
     project_dir = ensure_project(args.project)
     history_dir = today_history_dir(project_dir)
+    session = ReconSession(project_dir, history_dir)
 
     init_logger(project_dir, module_name="recon")
 
     # Configure rate limiting (for tool-specific limits in config)
     configure_rate_limiter(config)
 
-    # Check for required tools before proceeding
-    from core.tool_installer import ToolInstaller
-    installer = ToolInstaller()
-    
+    # Check for required tools before proceeding; results are cached for the stages
     # Map steps to required tools
     step_tool_map = {
         "subs": ["subfinder"],
@@ -100,22 +89,23 @@ def run_cli(args, config):
         "ports_scan": ["naabu", "nmap"],
         "dirs": ["dirsearch"],
         "params": ["gau", "uro"],
-        "secrets": ["secretfinder"],
+        "secrets": ["secretfinder"] if getattr(args, "legacy_secretfinder", False) else [],
         "nuclei": ["nuclei"],
         "screens": ["eyewitness"]
     }
     
     steps = resolve_steps(args)
-    missing_tools = []
+    all_tools = sorted({tool for step in steps for tool in step_tool_map.get(step, [])})
     
-    for step in steps:
-        required_tools = step_tool_map.get(step, [])
-        for tool in required_tools:
-            if not installer.check_tool_installed(tool):
-                missing_tools.append(tool)
+    # Installer checks can shell out to pip; probe every tool at once
+    missing_tools = []
+    if all_tools:
+        with ThreadPoolExecutor(max_workers=len(all_tools)) as executor:
+            found = executor.map(command_exists_with_installer, all_tools)
+            missing_tools = [tool for tool, ok in zip(all_tools, found) if not ok]
     
     if missing_tools:
-        log_warn(f"Missing required tools: {', '.join(set(missing_tools))}")
+        log_warn(f"Missing required tools: {', '.join(missing_tools)}")
         log_info("Run with --install-interactive to install missing tools")
         log_info("Or run with --install to install all tools")
         log_info("Or run with --check-tools to see detailed status")
@@ -126,56 +116,78 @@ def run_cli(args, config):
         log_info(f"history_dir: {history_dir}")
         log_info(f"steps: {', '.join(sorted(list(steps)))}")
 
-        if "subs" in steps:
-            _run_wrapped("subs", run_subdomain_enum, project_dir, history_dir, args)
-
-        if "alive" in steps:
-            _run_wrapped("alive", run_alive_check, project_dir, history_dir, args)
-
-        if "ports_scan" in steps:
-            _run_wrapped("ports_scan", run_ports_scan, project_dir, history_dir, args)
-
-        if "dirs" in steps:
-            _run_wrapped("dirs", run_dirsearch, project_dir, history_dir, args)
-
-        if "params" in steps:
-            _run_wrapped("params", run_param_mining, project_dir, history_dir, args)
-
-        if "secrets" in steps:
-            _run_wrapped("secrets", run_secretfinder, project_dir, history_dir, args)
-
-        if "nuclei" in steps:
-            _run_wrapped("nuclei", run_nuclei, project_dir, history_dir, args)
-
-        if "screens" in steps:
-            _run_wrapped("screens", run_screenshots, project_dir, history_dir, args)
+        _run_steps(steps, session, args, max_workers=1 if getattr(args, 'serial', False) else None)
 
         meta_path = os.path.join(history_dir, "run_meta.json")
-        with open(meta_path, "w", encoding="utf-8") as f:
-            json.dump(
-                {
-                    "project_dir": project_dir,
-                    "history_dir": history_dir,
-                    "steps": sorted(list(steps)),
-                },
-                f,
-                indent=2,
-            )
+        meta = {
+            "project_dir": project_dir,
+            "history_dir": history_dir,
+            "steps": sorted(list(steps)),
+        }
+        # Encode once and replace the file atomically so an interrupted run never leaves a truncated meta
+        write_text(meta_path, json.dumps(meta, indent=2))
 
         log_ok(f"run_complete -> {history_dir}")
 
     finally:
+        # Flush even when a step failed so partial results are kept
+        flushed = session.pending.flush()
+        log_info(f"flushed {flushed} history files")
         close_logger()
 
 
-def _run_wrapped(step_name, fn, project_dir, history_dir, args):
+# Stage dependencies; a stage starts once every selected dependency has finished
+STEP_ORDER = ["subs", "alive", "ports_scan", "dirs", "params", "secrets", "nuclei", "screens"]
+STEP_DEPS = {
+    "subs": set(),
+    "alive": {"subs"},
+    "ports_scan": {"alive"},
+    "dirs": {"alive"},
+    "params": {"alive"},
+    "secrets": {"params"},
+    "nuclei": {"params"},
+    "screens": {"alive"},
+}
+
+
+def _run_steps(steps, session, args, max_workers=None):
+    """Run the selected steps, starting independent ones concurrently"""
+    step_funcs = {
+        "subs": run_subdomain_enum,
+        "alive": run_alive_check,
+        "ports_scan": run_ports_scan,
+        "dirs": run_dirsearch,
+        "params": run_param_mining,
+        "secrets": run_secretfinder,
+        "nuclei": run_nuclei,
+        "screens": run_screenshots,
+    }
+    pending = [s for s in STEP_ORDER if s in steps]
+    done = set()
+    running = {}
+
+    # Steps mostly wait on external tools, so give every selected step its own worker;
+    # a ready step should never queue behind a fixed pool size
+    with ThreadPoolExecutor(max_workers=max_workers or max(1, len(pending))) as executor:
+        while pending or running:
+            for step in [s for s in pending if (STEP_DEPS[s] & steps) <= done]:
+                pending.remove(step)
+                running[executor.submit(_run_wrapped, step, step_funcs[step], session, args)] = step
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                done.add(running.pop(future))
+                future.result()
+
+
+def _run_wrapped(step_name, fn, session, args):
     done = time_block(step_name)
     log_info(f"step_start: {step_name}")
     try:
         if args is None:
-            fn(project_dir, history_dir)
+            fn(session)
         else:
-            fn(project_dir, history_dir, args)
+            fn(session, args)
         log_ok(f"step_ok: {step_name}")
     except SystemExit:
         raise
@@ -227,77 +239,58 @@ def get_wildcard_list_path(project_dir, wildcard_list_name):
 
 
 def fetch_crtsh_domains(domain):
-    q = urllib.parse.quote(domain)
-    url = f"https://crt.sh/?q={q}&output=json"
-    req = urllib.request.Request(url, headers={"User-Agent": "ryus-recon"})
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        raw = resp.read().decode("utf-8", errors="ignore")
-
-    try:
-        data = json.loads(raw)
-    except json.JSONDecodeError:
-        return []
-
-    names = []
-    for item in data:
-        nv = item.get("name_value", "")
-        for part in str(nv).split("\n"):
-            s = part.strip().lstrip("*.").strip()
-            if s and " " not in s and "/" not in s:
-                names.append(s)
-    return names
+    return ToolFactory.get_tool('subfinder').fetch_crtsh_domains(domain)
 
 
-def run_subdomain_enum(project_dir, history_dir, args):
+def run_subdomain_enum(session, args):
     """Execute subdomain enumeration using SubfinderTool"""
-    tool = ToolFactory.get_tool('subfinder')
-    tool.run(project_dir, history_dir, args)
+    tool = ToolFactory.get_tool('subfinder', session=session)
+    tool.run(session.project_dir, session.history_dir, args)
 
 
-def run_alive_check(project_dir, history_dir, args):
+def run_alive_check(session, args):
     """Execute alive checking using HttpxTool"""
-    tool = ToolFactory.get_tool('httpx')
-    tool.run(project_dir, history_dir, args)
+    tool = ToolFactory.get_tool('httpx', session=session)
+    tool.run(session.project_dir, session.history_dir, args)
 
 
-def run_ports_scan(project_dir, history_dir, args):
+def run_ports_scan(session, args):
     """Execute port scanning using NaabuTool and NmapTool"""
     # Run naabu for port discovery on alive hosts
-    # naabu_tool = ToolFactory.get_tool('naabu')
-    # naabu_tool.run(project_dir, history_dir, args)
+    # naabu_tool = ToolFactory.get_tool('naabu', session=session)
+    # naabu_tool.run(session.project_dir, session.history_dir, args)
     
     # Run independent nmap for detailed scanning with incremental logic
-    nmap_tool = ToolFactory.get_tool('nmap')
-    nmap_tool.run(project_dir, history_dir, args)
+    nmap_tool = ToolFactory.get_tool('nmap', session=session)
+    nmap_tool.run(session.project_dir, session.history_dir, args)
 
 
-def run_dirsearch(project_dir, history_dir, args):
+def run_dirsearch(session, args):
     """Execute directory search using DirsearchTool"""
-    tool = ToolFactory.get_tool('dirsearch')
-    tool.run(project_dir, history_dir, args)
+    tool = ToolFactory.get_tool('dirsearch', session=session)
+    tool.run(session.project_dir, session.history_dir, args)
 
 
-def run_param_mining(project_dir, history_dir, args):
+def run_param_mining(session, args):
     """Execute parameter mining using GauUroTool"""
-    tool = ToolFactory.get_tool('gau_uro')
-    tool.run(project_dir, history_dir, args)
+    tool = ToolFactory.get_tool('gau_uro', session=session)
+    tool.run(session.project_dir, session.history_dir, args)
 
 
-def run_secretfinder(project_dir, history_dir, args):
+def run_secretfinder(session, args):
     """Execute secret finding using SecretFinderTool"""
-    tool = ToolFactory.get_tool('secretfinder')
-    tool.run(project_dir, history_dir, args)
+    tool = ToolFactory.get_tool('secretfinder', session=session)
+    tool.run(session.project_dir, session.history_dir, args)
 
 
-def run_nuclei(project_dir, history_dir, args):
+def run_nuclei(session, args):
     """Execute nuclei scanning using NucleiTool"""
-    tool = ToolFactory.get_tool('nuclei')
-    tool.run(project_dir, history_dir, args)
+    tool = ToolFactory.get_tool('nuclei', session=session)
+    tool.run(session.project_dir, session.history_dir, args)
 
 
-def run_screenshots(project_dir, history_dir, args):
+def run_screenshots(session, args):
     """Execute screenshot capture using EyewitnessTool"""
-    from core.tools import EyewitnessTool
-    tool = EyewitnessTool()
-    tool.run(project_dir, history_dir, args)
+    tool = ToolFactory.get_tool('eyewitness', session=session)
+    tool.run(session.project_dir, session.history_dir, args)
 
@@ -1,33 +1,30 @@
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from urllib.parse import urlsplit
 
-from core.runner import command_exists, command_exists_with_installer, run_command, ensure_dir
+from core.runner import command_exists, command_exists_with_installer, run_command, run_command_pipe, ensure_dir
 from core.project import (
     ensure_project,
     today_history_dir,
     merge_into_canonical,
     write_lines,
-    read_lines,
+    append_new_lines,
 )
 from core.logger import log_info, log_ok, log_warn, time_block
 from core.logger import init_logger, close_logger
 from core.rate_limiter import get_global_rate_limiter, configure_rate_limiter
-from core.webhook import send_subdomain_notification, is_valid_webhook_url
+from core.fastprobe import probe_hosts, supports_ports
+from core.state import ScanState
+from core.webhook import send_subdomain_notification, get_discord_webhook_url
 
 module_key = "subs"
 module_name = "Scans Default: subs.txt for new subodomains"
 cli_name = "subs"
 
-
-def get_discord_webhook_url():
-    """Read Discord webhook URL from user's config file"""
-    webhook_file = os.path.expanduser("~/.recon_discord")
-    if os.path.exists(webhook_file):
-        with open(webhook_file, "r", encoding="utf-8") as f:
-            webhook_url = f.read().strip()
-            if webhook_url and is_valid_webhook_url(webhook_url):
-                return webhook_url
-    return None
+_DOMAIN_BRE = re.compile(rb"(?m)^[ \t]*(?:https?://|(?!https?://))([^/\s]+)")
 
 
 def register_args(parser):
@@ -37,6 +34,51 @@ def register_args(parser):
     parser.add_argument("--threads", type=int, default=50, help="Threads for httpx")
     parser.add_argument("--rl", type=int, default=10, help="Rate limit for subfinder")
     parser.add_argument("--discord-webhook", action="store_true", help="Send Discord notifications (requires webhook file)")
+    parser.add_argument("--prune_redundant", action="store_true",
+                        help="Skip probing subdomains whose parent subdomain was also found (e.g. a.b.example.com when b.example.com is present)")
+    parser.add_argument("--fast_probe", action="store_true",
+                        help="Check aliveness in-process (TCP connect on 80, TLS handshake on 443) instead of running httpx; only for --ports 80/443")
+    parser.add_argument("--subfinder_shards", type=int, default=1,
+                        help="Concurrent subfinder processes to split the input domains across (the -rl budget is shared)")
+    parser.add_argument("--alive_ttl", type=float, default=0,
+                        help="Reuse alive results younger than this many hours instead of probing those subdomains again (default 0: off)")
+
+
+def _nonblank_lines(text):
+    """Stripped non-blank lines of a tool's captured output, one strip per line"""
+    return list(filter(None, (line.strip() for line in text.splitlines())))
+
+
+def _subfinder_cmd(rl):
+    return ["subfinder", "-all", "-recursive", "-silent", "-rl", str(rl)]
+
+
+def _run_subfinder_shards(domains, rl, shards):
+    """Split the domains across concurrent subfinder processes that share the -rl budget.
+    Returns (first failed result or the first result, merged unique subdomains)"""
+    cmd = _subfinder_cmd(max(1, rl // shards))
+    parts = [domains[i::shards] for i in range(shards)]
+    log_info(f"Running {shards} subfinder shards at -rl {cmd[-1]} each")
+    with ThreadPoolExecutor(max_workers=shards) as executor:
+        results = list(executor.map(
+            lambda part: run_command(cmd, timeout=3600, apply_rate_limit=True, input_data="".join(d + "\n" for d in part)),
+            parts,
+        ))
+    res = next((result for result in results if result.returncode != 0), results[0])
+    return res, list(dict.fromkeys(s for result in results for s in _nonblank_lines(result.stdout)))
+
+
+def prune_redundant_subdomains(subdomains):
+    """Drop subdomains that have a parent in the list, using one sort of the reversed names and a linear scan"""
+    kept = []
+    prev = None
+    # Reversed with a trailing dot, every child sorts right after its parent and starts with it
+    for rev in sorted({s.lower()[::-1] + "." for s in subdomains}):
+        if prev is not None and rev.startswith(prev):
+            continue
+        kept.append(rev[-2::-1])
+        prev = rev
+    return kept
 
 
 def run_tui(stdscr, config):
@@ -69,92 +111,49 @@ def run_subs_discovery(project_dir, history_dir, args):
     if not os.path.exists(input_file):
         raise SystemExit(f"Missing input file: {input_file}")
 
+    # Resolve the webhook once up front, so a missing config is reported before the long enumeration
+    webhook_url = None
+    project_name = os.path.basename(project_dir.rstrip('/'))
+    if getattr(args, 'discord_webhook', False):
+        webhook_url = get_discord_webhook_url()
+        if not webhook_url:
+            log_warn("Discord webhook enabled but no valid webhook found in ~/.recon_discord")
+
     # Check required tools
     if not command_exists_with_installer("subfinder"):
         log_warn("subfinder not found; skipping subs discovery")
         return
 
-    if not command_exists_with_installer("httpx"):
-        log_warn("httpx not found; skipping subs discovery")
-        return
+    fast_probe = getattr(args, 'fast_probe', False)
+    if fast_probe and not supports_ports(getattr(args, 'ports', '80,443')):
+        log_warn("--fast_probe only covers ports 80 and 443; using httpx")
+        fast_probe = False
 
-    if not command_exists_with_installer("anew"):
-        log_warn("anew not found; skipping subs discovery")
+    if not fast_probe and not command_exists_with_installer("httpx"):
+        log_warn("httpx not found; skipping subs discovery")
         return
 
-    # Read input URLs/domains
-    with open(input_file, "r", encoding="utf-8", errors="ignore") as f:
-        targets = [x.strip() for x in f.readlines() if x.strip()]
-
-    # Extract domains from URLs if needed
-    domains = []
-    for target in targets:
-        if target.startswith("http"):
-            # Extract domain from URL
-            domain = target.replace("https://", "").replace("http://", "").split("/")[0].strip()
-        else:
-            domain = target.strip()
-        if domain:
-            domains.append(domain)
-
-    # Remove duplicates
-    domains = list(set(domains))
+    # Read input URLs/domains and strip any scheme and path with one regex sweep over the raw bytes;
+    # dict.fromkeys dedupes in input order, so only the unique survivors get decoded
+    with open(input_file, "rb") as f:
+        raw_domains = dict.fromkeys(_DOMAIN_BRE.findall(f.read()))
+    domains = list(dict.fromkeys(d for d in (b.decode("utf-8", errors="ignore") for b in raw_domains) if d))
     log_info(f"Enumerating subdomains for {len(domains)} domains")
 
     # Enumerate subdomains using subfinder
-    all_subdomains = []
     subs_out_path = os.path.join(history_dir, "new_subdomains.txt")
-    
-    # Create temporary domain list for subfinder
-    temp_domains_path = os.path.join(history_dir, "temp_domains.txt")
-    write_lines(temp_domains_path, domains)
-    
-    cmd = [
-        "subfinder",
-        "-dL",
-        temp_domains_path,
-        "-all",
-        "-recursive",
-        "-o",
-        subs_out_path,
-        "-rl",
-        str(getattr(args, 'rl', 10)),
-    ]
-    res = run_command(cmd, timeout=3600, apply_rate_limit=True)
-    if res.returncode != 0:
-        log_warn(f"subfinder rc={res.returncode}")
-        if res.stderr:
-            log_warn(res.stderr.strip()[:2000])
-        return
-
-    # Read enumerated subdomains
-    if os.path.exists(subs_out_path):
-        with open(subs_out_path, "r", encoding="utf-8", errors="ignore") as f:
-            all_subdomains = [x.strip() for x in f.readlines() if x.strip()]
-
-    if not all_subdomains:
-        log_info("No subdomains found")
-        return
 
-    log_info(f"Found {len(all_subdomains)} subdomains, checking aliveness")
+    # subfinder reads the domain list from stdin, so no temp file is written
+    domains_input = "".join(d + "\n" for d in domains)
+    rl = getattr(args, 'rl', 10)
+    cmd = _subfinder_cmd(rl)
+    shards = max(1, min(getattr(args, 'subfinder_shards', 1) or 1, len(domains)))
 
-    # Use anew to append new subdomains to new_subs.txt in history folder
-    history_subs_path = os.path.join(history_dir, "new_subs.txt")
-    subs_shell_cmd = f"cat {subs_out_path} | anew {history_subs_path}"
-    subs_anew_res = run_command(["bash", "-c", subs_shell_cmd], timeout=300)
-    if subs_anew_res.returncode != 0:
-        log_warn(f"anew (subdomains) rc={subs_anew_res.returncode}")
-        if subs_anew_res.stderr:
-            log_warn(subs_anew_res.stderr.strip()[:2000])
-    else:
-        log_info(f"Appended subdomains to {history_subs_path}")
-
-# Check which subdomains are alive using httpx
+    # Check which subdomains are alive using httpx, fed straight from subfinder's stdout
     alive_out_path = os.path.join(history_dir, "new_alive.txt")
     alive_cmd = [
         "httpx",
-        "-l",
-        subs_out_path,
+        "-silent",
         "-ports",
         getattr(args, 'ports', '80,443'),
         "-threads",
@@ -162,18 +161,116 @@ def run_subs_discovery(project_dir, history_dir, args):
         "-o",
         alive_out_path,
     ]
-    
-    alive_res = run_command(alive_cmd, timeout=3600, apply_rate_limit=True)
-    if alive_res.returncode != 0:
-        log_warn(f"httpx rc={alive_res.returncode}")
-        if alive_res.stderr:
-            log_warn(alive_res.stderr.strip()[:2000])
+
+    # With --alive_ttl, subdomains found alive within the TTL keep their earlier urls instead of being probed again;
+    # only alive results are cached, so a dead host is always re-checked
+    state = ScanState(project_dir)
+    alive_ttl = getattr(args, 'alive_ttl', 0) or 0
+    cached = {}
+    if alive_ttl > 0:
+        cutoff = time.time() - alive_ttl * 3600
+        state.prune_alive(cutoff)
+        cached = state.alive_since(cutoff)
+    carried = []
+    reused = 0
+    history_subs_path = os.path.join(history_dir, "new_subs.txt")
+    history_append = None
+    probed_alive = None
+
+    prune = getattr(args, 'prune_redundant', False)
+    if prune or fast_probe or shards > 1 or cached:
+        # Pruning, the in-process probe, sharding and the alive cache need the complete list, so subfinder has to finish first
+        if shards > 1:
+            res, all_subdomains = _run_subfinder_shards(domains, rl, shards)
+        else:
+            res = run_command(cmd, timeout=3600, apply_rate_limit=True, input_data=domains_input)
+            all_subdomains = _nonblank_lines(res.stdout)
+        write_lines(subs_out_path, all_subdomains)
+        alive_res = None
+        if res.returncode == 0 and all_subdomains:
+            targets = all_subdomains
+            if prune:
+                done = time_block("prune_redundant")
+                targets = prune_redundant_subdomains(all_subdomains)
+                done()
+                log_info(f"Pruned {len(all_subdomains) - len(targets)} subdomains already covered by a parent")
+            to_probe = []
+            for target in dict.fromkeys(targets):
+                urls = cached.get(target.lower())
+                if urls:
+                    carried.extend(urls)
+                    reused += 1
+                else:
+                    to_probe.append(target)
+            # The history append works on its own file, so it runs alongside the probe
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                history_append = executor.submit(append_new_lines, history_subs_path, all_subdomains)
+                if not to_probe:
+                    probed_alive = []
+                elif fast_probe:
+                    done = time_block("fast_probe")
+                    probed_alive = probe_hosts(to_probe, getattr(args, 'ports', '80,443'))
+                    done()
+                else:
+                    alive_res = run_command(alive_cmd, timeout=3600, apply_rate_limit=True,
+                                            input_data="".join(t + "\n" for t in to_probe))
+    else:
+        # httpx probes while subfinder is still enumerating; the subdomains are archived on their way through
+        all_subdomains = []
+        with open(subs_out_path, "w", encoding="utf-8", buffering=1 << 20) as subs_out:
+            def collect(line):
+                line = line.strip()
+                if line:
+                    subs_out.write(line + "\n")
+                    all_subdomains.append(line)
+
+            res, alive_res = run_command_pipe(cmd, alive_cmd, on_line=collect, input_data=domains_input,
+                                              timeout=3600, consumer_timeout=3600, apply_rate_limit=True)
+    if res.returncode != 0:
+        log_warn(f"subfinder rc={res.returncode}")
+        if res.stderr:
+            log_warn(res.stderr.strip()[:2000])
         return
 
-    # Read alive subdomains
-    alive_subdomains = []
-    if os.path.exists(alive_out_path):
-        alive_subdomains = read_lines(alive_out_path)
+    if not all_subdomains:
+        log_info("No subdomains found")
+        return
+
+    log_info(f"Found {len(all_subdomains)} subdomains, checked aliveness")
+
+    # Append new subdomains to new_subs.txt in history folder
+    if history_append is None:
+        append_new_lines(history_subs_path, all_subdomains)
+    else:
+        history_append.result()
+    log_info(f"Appended subdomains to {history_subs_path}")
+
+    if probed_alive is None:
+        if alive_res.returncode != 0:
+            log_warn(f"httpx rc={alive_res.returncode}")
+            if alive_res.stderr:
+                log_warn(alive_res.stderr.strip()[:2000])
+            return
+
+        # httpx runs with -silent, so its captured stdout is exactly what it wrote to alive_out_path
+        probed_alive = _nonblank_lines(alive_res.stdout)
+
+    if alive_ttl > 0:
+        # Remember the urls each probed subdomain answered on
+        urls_by_host = {}
+        for url in probed_alive:
+            host = urlsplit(url if "://" in url else "//" + url).hostname
+            if host:
+                urls_by_host.setdefault(host.lower(), []).append(url)
+        state.mark_alive(urls_by_host, time.time())
+
+    if reused:
+        log_info(f"Reused alive results for {reused} subdomains checked in the last {alive_ttl:g}h")
+    alive_subdomains = probed_alive + list(dict.fromkeys(carried))
+
+    # httpx only wrote what it probed; the fast probe's and the cache's results are written here
+    if alive_res is None or carried:
+        write_lines(alive_out_path, alive_subdomains)
 
     if not alive_subdomains:
         log_info("No alive subdomains found")
@@ -181,48 +278,26 @@ def run_subs_discovery(project_dir, history_dir, args):
 
     log_info(f"Found {len(alive_subdomains)} alive subdomains")
 
-    # Use anew to append new alive subdomains to canonical alive.txt
+    # Append new alive subdomains to canonical alive.txt
     alive_txt_path = os.path.join(project_dir, "alive.txt")
-    
-    # Create temporary file with alive subdomains for anew
-    temp_alive_path = os.path.join(history_dir, "temp_alive_for_anew.txt")
-    write_lines(temp_alive_path, alive_subdomains)
-    
-    # Run anew with the alive subdomains file
-    shell_cmd = f"cat {temp_alive_path} | anew {alive_txt_path}"
-    anew_res = run_command(["bash", "-c", shell_cmd], timeout=300)
-    if anew_res.returncode != 0:
-        log_warn(f"anew rc={anew_res.returncode}")
-        if anew_res.stderr:
-            log_warn(anew_res.stderr.strip()[:2000])
-        return
+    new_alive = append_new_lines(alive_txt_path, alive_subdomains)
 
     # Log results
-    log_ok(f"subs: +{len(alive_subdomains)} alive subdomains appended to {alive_txt_path}")
-
-    # Send Discord notification if flag is passed
-    discord_webhook_enabled = getattr(args, 'discord_webhook', False)
-    if discord_webhook_enabled:
-        # Read webhook URL from config file
-        webhook_url = get_discord_webhook_url()
-        if not webhook_url:
-            log_warn("Discord webhook enabled but no valid webhook found in ~/.recon_discord")
+    log_ok(f"subs: +{len(new_alive)} alive subdomains appended to {alive_txt_path}")
+
+    # Send Discord notification if flag is passed (webhook and project name were resolved up front)
+    if webhook_url:
+        success = send_subdomain_notification(
+            webhook_url=webhook_url,
+            project_name=project_name,
+            new_subs_count=len(all_subdomains),
+            new_alive_count=len(alive_subdomains),
+            sample_subs=alive_subdomains[:5]
+        )
+        
+        if success:
+            log_info("Discord notification sent successfully")
         else:
-            # Extract project name from path
-            project_name = os.path.basename(project_dir.rstrip('/'))
-            
-            # Send notification
-            success = send_subdomain_notification(
-                webhook_url=webhook_url,
-                project_name=project_name,
-                new_subs_count=len(all_subdomains),
-                new_alive_count=len(alive_subdomains),
-                sample_subs=alive_subdomains[:5] if alive_subdomains else None
-            )
-            
-            if success:
-                log_info("Discord notification sent successfully")
-            else:
-                log_warn("Failed to send Discord notification")
+            log_warn("Failed to send Discord notification")
 
                 # working on discord integration
\ No newline at end of file